@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+benchmark.py
+
+Usage:
+  python benchmark.py --sizes 1000,10000 --json results.json
+  python benchmark.py --sizes 1000,10000 --compare results.json --threshold 0.10
+  python benchmark.py --engines --sizes 5000
+  python benchmark.py --hrefs
+
+Generates synthetic Simplify-style Markdown and HTML tables (with '↳'
+continuation rows, emoji flags and relative dates) and times every stage
+of the parse -> postprocess -> merge -> classify pipeline at each size.
+For each stage it reports wall time (best of --repeat), throughput and
+peak memory, measured in a separate run so it does not skew the timings.
+Every run starts with cold process-wide memo caches (normalize_date, the
+keyword matcher, a fresh tier index), so cache-hit speed is not reported
+as stage speed. Peak memory is Python allocations (tracemalloc), except for
+the HTML parse stages: lxml allocates outside the Python heap, so those
+report the peak RSS growth of a child process that runs only that stage.
+
+--json writes the results as JSON; --compare checks them against an earlier
+JSON file and exits non-zero if any stage lost more than --threshold of its
+throughput, so changes can be gated on speed.
+
+--engines instead compares the HTML table engines in internship.py on the
+whole text and in --stream mode, and checks every engine's rows against the
+BeautifulSoup reference.
+
+--hrefs checks the regex fast path of extract_href against BeautifulSoup
+on the link cells of the synthetic tables, known edge cases and random
+combinations of tricky fragments, and exits non-zero on any mismatch.
+tests/test_extract_href.py runs the same check on a seeded sample.
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import classify
+import internship
+import merge_csv
+import metrics
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+COMPANIES = ['Whatnot', 'Seagate', 'State Street', 'Google', 'Jane Street', 'Amazon Web Services',
+             'Capital One', 'Cox Automotive Inc', 'Acme Robotics', 'Northwind Labs']
+ROLES = ['Software Engineer Intern', 'Backend Intern', 'Marketing Intern',
+         'Firmware Engineering Intern', 'Data Engineer Intern', 'Product Design Intern',
+         'SDE Intern', 'Full-Stack Developer Intern', 'Finance Intern']
+LOCATIONS = ['San Francisco, CA', 'New York, NY', 'Seattle, WA', 'Toronto, Canada', 'Remote',
+             'London, UK', 'Austin, TX']
+AGES = ['0d', '3d', '12d', '1mo', '2mo', 'Sep 24', 'Oct 3']
+FLAGS = ['', '', '', ' 🛂', ' 🇺🇸', ' 🔥', ' 🎓']
+
+def _synthetic_rows(n_rows, seed):
+    """Yields (company, role, location, link, age) cells; every 4th row starts a new company."""
+    rnd = random.Random(seed)
+    for i in range(n_rows):
+        if i % 4 == 0:
+            # 일부는 티어 목록에 없는 회사 이름으로 만들어 부분 일치 경로도 측정
+            company = rnd.choice(COMPANIES) if rnd.random() < 0.7 else f'Startup {rnd.randrange(n_rows)}'
+        else:
+            company = '↳'
+        link = f'https://jobs.example.com/{rnd.randrange(n_rows)}?utm_source=Simplify&ref=Simplify'
+        yield (company, rnd.choice(ROLES) + rnd.choice(FLAGS), rnd.choice(LOCATIONS), link, rnd.choice(AGES))
+
+def generate_markdown(n_rows, seed=0):
+    parts = ['# Summer 2026 Internships\n\n',
+             '| Company | Role | Location | Application/Link | Date Posted |\n',
+             '| ------- | ---- | -------- | ---------------- | ----------- |\n']
+    for company, role, location, link, age in _synthetic_rows(n_rows, seed):
+        if company != '↳':
+            company = f'**[{company}](https://simplify.jobs/c/{company.replace(" ", "-")})**'
+        parts.append(
+            f'| {company} | {role} | {location} | '
+            f'<a href="{link}"><img src="https://i.imgur.com/u1KNU8z.png" width="118" alt="Apply"></a> '
+            '<a href="https://simplify.jobs/p/x"><img src="https://i.imgur.com/aVnQdox.png" width="30" alt="Simplify"></a>'
+            f' | {age} |\n'
+        )
+    return ''.join(parts)
+
+def generate_html(n_rows, seed=0):
+    parts = ['# Summer 2026 Internships\n\n<table>\n<thead>\n<tr><th>Company</th><th>Role</th>'
+             '<th>Location</th><th>Application</th><th>Age</th></tr>\n</thead>\n<tbody>\n']
+    rnd = random.Random(seed + 1)
+    for company, role, location, link, age in _synthetic_rows(n_rows, seed):
+        if company != '↳':
+            company = f'<strong><a href="https://simplify.jobs/c/x">{company}</a></strong>'
+        if rnd.random() < 0.2:
+            location = ('<details><summary><strong>2 locations</strong></summary>'
+                        f'{location}<br>{rnd.choice(LOCATIONS)}</details>')
+        parts.append(
+            '<tr>\n'
+            f'<td>{company}</td>\n'
+            f'<td>{role}</td>\n'
+            f'<td>{location}</td>\n'
+            f'<td><div align="center"><a href="{link}">'
+            '<img src="https://i.imgur.com/u1KNU8z.png" width="118" alt="Apply"></a></div></td>\n'
+            f'<td>{age}</td>\n'
+            '</tr>\n'
+        )
+    parts.append('</tbody>\n</table>\n')
+    return ''.join(parts)
+
+# extract_href 비교용: 원래 BeautifulSoup 결과와 달라지기 쉬운 셀
+HREF_EDGE_CASES = [
+    '', 'Closed 🔒', '<a href="https://x/1">Apply</a>', "<a href='https://x/2'>Apply</a>",
+    '<A HREF="https://x/3">Apply</A>', '<a  href = "https://x/4" >Apply</a>', '<a href=https://x/5>Apply</a>',
+    '<a href="https://x/6?a=1&amp;b=2">Apply</a>', '<a name="top">no link</a>', '<a>empty</a>',
+    '<a href="https://x/7" href="https://x/8">dup</a>', '<a\nhref="https://x/9">newline</a>',
+    '<img alt="<a href=\'fake\'>"><a href="real">', '<p <a href="x">', '<!-- <a href="c"> --><a href="d">',
+    '<script><a href="s"></script><a href="t">', '<abbr title="a"><a href="u">', '<area href="v"><a href="w">',
+    'text "quoted" <a href="q">', '<a href="https://x/10"/>', '<a data-x="<a href=\'in\'>" href="out">',
+]
+HREF_FRAGMENTS = [
+    '<a href="https://f/1">', "<a href='https://f/2'>", '<A HREF="https://f/3">', '<a>', '</a>', '<a name="n">',
+    '<img src="i.png" alt="Apply">', '<img alt="<a href=\'fake\'>">', '<p ', '<!-- ', ' -->', '<br/>',
+    '<strong>', '</strong>', '<div align="center">', '"', "'", '<', '>', '&amp;', 'Apply', ' ',
+    '<a href="https://f/4?x=1&amp;y=2">', '<a href=https://f/5>', '<script>', '</script>', '<abbr>',
+]
+
+def href_parity_cases(n_random, seed=0):
+    """Link cells from the synthetic tables, the edge cases above, and random fragment combinations."""
+    rnd = random.Random(seed)
+    cases = list(HREF_EDGE_CASES)
+    md = generate_markdown(50, seed)
+    cases += [line.split('|')[4] for line in md.splitlines()[3:]]
+    html_rows = generate_html(50, seed).split('<tr>')[2:]
+    cases += [cell.split('</td>')[0] for row in html_rows for cell in row.split('<td>')[1:]]
+    for _ in range(n_random):
+        cases.append(''.join(rnd.choice(HREF_FRAGMENTS) for _ in range(rnd.randint(1, 6))))
+    return cases
+
+def check_href_parity(cases):
+    """Returns the cells where extract_href and the BeautifulSoup reference disagree."""
+    mismatches = []
+    for cell in cases:
+        fast = internship.extract_href(cell)
+        soup = internship._extract_href_soup(cell)
+        if fast != soup:
+            mismatches.append((cell, fast, soup))
+    return mismatches
+
+def reset_caches():
+    """Empties the process-wide memo caches so every timed run starts cold, like a fresh script run."""
+    internship.normalize_date.cache_clear()
+    internship._cached_matcher.cache_clear()
+    # 새 TierIndex (빈 메모): 인덱스 생성 자체는 측정에서 제외
+    classify._index = None
+    classify.get_tier_index()
+
+def time_call(fn, repeat, setup=None):
+    """
+    Returns (best wall time, result of the last call). The caches are reset
+    and setup() runs untimed before each call.
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        reset_caches()
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        result = fn(arg) if setup else fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def peak_memory(fn, setup=None):
+    """Returns the peak Python memory (MB) allocated while fn runs."""
+    reset_caches()
+    arg = setup() if setup else None
+    tracemalloc.start()
+    try:
+        fn(arg) if setup else fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1e6
+
+def _proc_status_mb(field):
+    with open('/proc/self/status', 'r', encoding='ascii') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1]) / 1e3
+    return None
+
+def _html_parse_rss(path, engine):
+    # 자식 프로세스에서 실행: 입력을 읽은 뒤부터 파싱이 끝날 때까지 늘어난 최대 RSS
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    try:
+        # Linux: 최대 RSS 기록(VmHWM)을 현재 RSS로 초기화해 import 때의 최고치를 빼고 측정
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+            f.write('5')
+        before = _proc_status_mb('VmRSS')
+        peak = lambda: _proc_status_mb('VmHWM')
+    except OSError:
+        before = metrics.peak_rss_mb()
+        peak = metrics.peak_rss_mb
+    internship.parse_html_table(text, internship.DEFAULT_KEYWORDS, engine)
+    after = peak()
+    return None if before is None or after is None else max(after - before, 0.0)
+
+def html_parse_peak_rss(text, engine, workdir):
+    """
+    Returns the peak RSS growth (MB) of parse_html_table in a fresh child
+    process, which also counts memory that lxml allocates outside the
+    Python heap. None where peak RSS is not available (Windows).
+    """
+    path = os.path.join(workdir, 'bench_table.html')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(_html_parse_rss, (path, engine))
+
+def bench_html_engines(text, keywords, repeat):
+    lines = text.splitlines(keepends=True)
+    cases = []
+    for engine in internship.HTML_ENGINES:
+        cases.append((f'{engine} (whole text)',
+                      lambda e=engine: internship.parse_html_table(text, keywords, e)))
+        cases.append((f'{engine} (stream)',
+                      lambda e=engine: list(internship.iter_html_rows(lines, keywords, e))))
+
+    reference = None
+    results = []
+    for name, fn in cases:
+        elapsed, rows = time_call(fn, repeat)
+        if reference is None:
+            reference = rows
+        results.append((name, elapsed, len(rows), rows == reference))
+    return results
+
+def write_rows_csv(rows, path):
+    fieldnames = list(rows[0]) if rows else ['Company', 'Role', 'Date Posted', 'Location', 'Link']
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def run_classify(workdir):
+    """Runs classify.py on workdir/csv_files/merged_jobs.csv in a child process."""
+    subprocess.run([sys.executable, os.path.join(BASE_DIR, 'classify.py')], cwd=workdir,
+                   check=True, stdout=subprocess.DEVNULL)
+
+def bench_size(n_rows, args, workdir):
+    """Times every pipeline stage on n_rows synthetic rows and returns result dicts."""
+    keywords = internship.DEFAULT_KEYWORDS
+    md_text = generate_markdown(n_rows, args.seed)
+    html_text = generate_html(n_rows, args.seed)
+    quiet = contextlib.redirect_stdout(io.StringIO())
+
+    parsed = internship.parse_markdown_table(md_text, keywords)
+    processed = internship.postprocess_rows([dict(r) for r in parsed])
+    # 병합 단계 입력: 처리된 행을 절반씩 겹치게 두 파일로 나눔
+    new_csv = os.path.join(workdir, 'new.csv')
+    master_csv = os.path.join(workdir, 'master.csv')
+    write_rows_csv(processed[: len(processed) * 3 // 4], new_csv)
+    write_rows_csv(processed[len(processed) // 4:], master_csv)
+    merged_csv = os.path.join(workdir, 'csv_files', 'merged_jobs.csv')
+
+    def merge():
+        with quiet:
+            merge_csv.merge_unique_rows([new_csv, master_csv], 'Link', merged_csv)
+
+    # (이름, 입력 행 수, 함수, setup, HTML 엔진: 메모리를 자식 프로세스 RSS로 측정)
+    stages = [
+        ('parse_markdown_table', n_rows, lambda: internship.parse_markdown_table(md_text, keywords), None, None),
+    ]
+    for engine in args.html_engines:
+        stages.append((f'parse_html_table[{engine}]', n_rows,
+                       lambda e=engine: internship.parse_html_table(html_text, keywords, e), None, engine))
+    stages += [
+        ('postprocess_rows', len(parsed), internship.postprocess_rows, lambda: [dict(r) for r in parsed], None),
+        ('merge_unique_rows', len(processed) * 3 // 2, merge, None, None),
+    ]
+
+    results = []
+    for stage, rows_in, fn, setup, engine in stages:
+        seconds, out = time_call(fn, args.repeat, setup)
+        peak_mb, peak_source = None, None
+        if not args.no_memory:
+            if engine:
+                peak_mb, peak_source = html_parse_peak_rss(html_text, engine, workdir), 'rss'
+            else:
+                peak_mb, peak_source = peak_memory(fn, setup), 'tracemalloc'
+            peak_mb = None if peak_mb is None else round(peak_mb, 2)
+        results.append(result_record(stage, n_rows, rows_in, seconds, peak_mb, peak_source))
+        print_result(results[-1])
+
+    # 분류 단계는 classify.py 스크립트 전체를 별도 프로세스로 실행해 측정
+    merge()
+    with open(merged_csv, newline='', encoding='utf-8') as f:
+        merged_count = sum(1 for _ in f) - 1
+    seconds, _ = time_call(lambda: run_classify(workdir), args.repeat)
+    results.append(result_record('classify (script)', n_rows, merged_count, seconds, None))
+    print_result(results[-1])
+
+    # 상주 프로세스처럼 모듈을 import해서 분류만 측정 (매번 빈 메모의 새 티어 인덱스로 시작)
+    with open(merged_csv, newline='', encoding='utf-8') as f:
+        merged_rows = list(csv.DictReader(f))
+    copy_rows = lambda: [dict(r) for r in merged_rows]
+    seconds, _ = time_call(classify.classify_jobs, args.repeat, copy_rows)
+    peak_mb = None if args.no_memory else round(peak_memory(classify.classify_jobs, copy_rows), 2)
+    results.append(result_record('classify_jobs', n_rows, merged_count, seconds, peak_mb,
+                                 None if args.no_memory else 'tracemalloc'))
+    print_result(results[-1])
+    return results
+
+def result_record(stage, size, rows_in, seconds, peak_mb, peak_source=None):
+    return {
+        'stage': stage,
+        'size': size,
+        'rows_in': rows_in,
+        'seconds': round(seconds, 6),
+        'rows_per_sec': round(rows_in / seconds, 1) if seconds > 0 else None,
+        'peak_mb': peak_mb,
+        'peak_source': peak_source,
+    }
+
+def print_result(r):
+    peak = f"{r['peak_mb']:8.1f} MB" if r['peak_mb'] is not None else '       - MB'
+    if r.get('peak_source') == 'rss':
+        peak += ' (RSS)'
+    print(f"{r['stage']:<26} {r['size']:>8} {r['rows_in']:>8} rows {r['seconds']:9.3f}s "
+          f"{r['rows_per_sec'] or 0:>12,.0f} rows/s {peak}")
+
+def compare_results(current, baseline, threshold):
+    """Prints the throughput ratio per (stage, size) and returns the list of regressions."""
+    previous = {(r['stage'], r['size']): r for r in baseline['results']}
+    regressions = []
+    print("-" * 30)
+    print(f"Compared with baseline from {baseline.get('created', '?')} (threshold {threshold:.0%})")
+    for r in current:
+        old = previous.get((r['stage'], r['size']))
+        if not old or not old.get('rows_per_sec') or not r.get('rows_per_sec'):
+            continue
+        ratio = r['rows_per_sec'] / old['rows_per_sec']
+        status = 'ok'
+        if ratio < 1 - threshold:
+            status = 'REGRESSION'
+            regressions.append((r['stage'], r['size'], ratio))
+        print(f"{r['stage']:<26} {r['size']:>8}  {ratio:6.2f}x  {status}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the internship parse/merge/classify pipeline.')
+    parser.add_argument('--sizes', default='1000,10000',
+                        help='Comma-separated row counts (default: 1000,10000; e.g. 1000,10000,100000,1000000).')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per stage; the best time is reported (default: 3).')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic tables (default: 0).')
+    parser.add_argument('--html-engines', default=','.join(internship.HTML_ENGINES),
+                        help='Comma-separated HTML engines to time (default: all).')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the peak-memory runs.')
+    parser.add_argument('--json', help='Write the results as JSON to this path.')
+    parser.add_argument('--compare', help='Baseline JSON from an earlier run to compare throughput against.')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Allowed throughput loss before --compare fails (default: 0.10).')
+    parser.add_argument('--engines', action='store_true',
+                        help='Only compare the HTML engines (speed and parity) on the first size.')
+    parser.add_argument('--hrefs', type=int, nargs='?', const=20000, metavar='N',
+                        help='Only check extract_href against BeautifulSoup on edge cases and N random cells '
+                             '(default: 20000).')
+    args = parser.parse_args()
+
+    if args.hrefs is not None:
+        cases = href_parity_cases(args.hrefs, args.seed)
+        mismatches = check_href_parity(cases)
+        for cell, fast, soup in mismatches[:20]:
+            print(f"MISMATCH {cell!r}: extract_href={fast!r} soup={soup!r}")
+        print(f"extract_href parity: {len(cases) - len(mismatches)}/{len(cases)} cells match")
+        if mismatches:
+            sys.exit(1)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    args.html_engines = [e.strip() for e in args.html_engines.split(',') if e.strip()]
+
+    if args.engines:
+        text = generate_html(sizes[0], args.seed)
+        print(f"Synthetic HTML table: {sizes[0]} rows, {len(text) / 1e6:.1f} MB")
+        results = bench_html_engines(text, internship.DEFAULT_KEYWORDS, args.repeat)
+        baseline = results[0][1]
+        print("-" * 30)
+        for name, elapsed, n_rows, same in results:
+            parity = 'ok' if same else 'MISMATCH'
+            print(f"{name:<20} {elapsed:8.3f}s  {baseline / elapsed:5.1f}x  rows={n_rows}  parity={parity}")
+        if not all(same for *_, same in results):
+            sys.exit(1)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bench_') as workdir:
+        os.makedirs(os.path.join(workdir, 'csv_files'))
+        for size in sizes:
+            results.extend(bench_size(size, args, workdir))
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to '{args.json}'")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} stage(s) slower than the baseline.")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,137 +1,268 @@
-import pandas as pd
+#!/usr/bin/env python3
+"""
+classify.py
+
+Usage:
+  python classify.py [merged_jobs.csv] [-o jobs_by_tier.xlsx]
+  python classify.py merged.arrow --no-excel --split-dir tiers/ --split-format parquet
+
+  from classify import classify_jobs
+  rows = classify_jobs([{'Company': 'Google', ...}, ...])   # adds 'Tier' to each row
+
+Assigns every job a company tier from tier_map.json and writes one Excel
+sheet (and optionally one file) per tier, in tier order.
+
+The module does no work at import time: the tier index is built on first
+use, kept for the life of the process and rebuilt only when the tier map
+file's mtime changes, and pandas/openpyxl are imported only when a
+DataFrame or a workbook is actually involved. A resident worker can call
+classify_jobs() on plain row dicts without importing pandas at all.
+
+--stats-json FILE and --profile FILE record timings, row counts and peak
+RSS of the run (see metrics.py).
+"""
+import argparse
+import json
+import os
 import re
 
-# 'openpyxl' 라이브러리가 설치되어 있어야 합니다. (pip install openpyxl)
-
-# Unclassified 목록까지 모두 포함하여 최종 업데이트된 티어 분류
-tier_map = {
-    "Tier 1: Top-Tier / Reach": [
-        "Adobe", "Akuna Capital", "Apple", "Asana", "Atlassian", "Balyasny Asset Management", "Bracebridge Capital",
-        "Citadel", "Citadel Securities", "Cloudflare", "D. E. Shaw", "Databricks", "Datadog", "Dropbox", 
-        "DV Commodities", "DV Group", "Figma", "Google", "Hudson River Trading", "IMC", "Jane Street", 
-        "Jump Trading", "Meta", "Millennium", "MongoDB", "Neuralink", "NVIDIA", "Notion", "OpenAI", "Optiver", 
-        "PDT Partners", "Pinterest", "Plaid", "Ramp", "Rippling", "Roblox", "Scale AI", "Scale.ai", 
-        "Stripe", "Susquehanna", "TikTok", "Tower Research Capital", "TransMarket Group", "Virtu"
-    ],
-    "Tier 2: Strongly Possible / Target": [
-        "Amazon", "AMD", "American Express", "Autodesk", "Barclays", "Belvedere Trading", "Block", 
-        "Block, Inc.", "ByteDance", "C3.ai", "Cisco", "Coinbase", "Confluent", "DraftKings", "Duolingo", 
-        "Electronic Arts", "Epic Games", "GitHub", "Goldman Sachs", "Grammarly", "IBM", "Intel", "Intuit", 
-        "JP Morgan Chase", "Klaviyo", "LinkedIn", "Lyft", "Microsoft", "Morgan Stanley", "Motorola", 
-        "Nuro", "Oracle", "PayPal", "Point72", "Qualcomm", "Riot Games", "Robinhood", "Salesforce", "Samsung", 
-        "SAP", "Schonfeld", "ServiceNow", "The Trade Desk", "Uber", "Veeam Software", "Verkada", "Waymo", 
-        "Zip", "Zoom"
-    ],
-    "Tier 3: Possible / Foundation": [
-        "84.51 Degrees", "ABB", "AbbVie", "Acadian Asset Management", "Activision-Blizzard", "AeroVironment", 
-        "Align Technology", "Allegion", "Altamira Technologies", "Altium Packaging", "Aluminum Dynamics", 
-        "Ameritas Life Insurance Corp", "Analog Devices", "Apex Fintech Solutions", "APEX Analytix", "Appian", 
-        "Aptiv", "Aquatic Capital Management", "Arch Capital Group", "Arconic", "Arm", "Arm Limited", 
-        "Arrowstreet Capital", "Assured Guaranty", "Astronautics", "Auto-Owners Insurance", "AVEVA", "Avery Dennison", 
-        "Axos Bank", "Badger Meter", "Baird", "Bank of America", "Barry-Wehmiller", "Berkshire Hathaway Energy", 
-        "Bessemer Trust", "BlackEdge Capital", "Bluestaq", "BNY", "Booz Allen", "Boston Scientific", 
-        "Brevium", "Brookfield Properties", "Brunswick", "C.H. Robinson", "Cadence Solutions", "CapTech Consulting", 
-        "Cardinal Health", "Cargill", "Carollo Engineers", "Cboe", "Cboe Global Markets", "CDK", "CDK Global", 
-        "CGI", "Charles Schwab", "Chatham Financial", "Chicago Trading Company", "Citizens Financial Group", 
-        "CME Group", "CNA", "Cohesity", "Comcast", "Compassion International", "Conagra Brands", "Copart", "Corpay", 
-        "Corteva", "Corteva Agriscience", "Cox", "Cox Automotive", "Cox Enterprises", "Deloitte", "Delta Air Lines, Inc.", 
-        "Dexcom", "Dick's Sporting Goods", "Diversified Automation", "DL Trading", "Dow Jones", "DriveTime", 
-        "EagleView", "Eaton Corporation", "Elanco", "Emerson Electric", "Enova", "Entrust", "Exegy", "FactSet", 
-        "Fifth Third Bank", "Fintech", "Five Rings", "Flowserve", "Freddie Mac", "Fresenius Medical Care", 
-        "Garmin", "GE Appliances", "GE Healthcare", "GE Vernova", "Generac", "General Motors", 
-        "Genuine Parts Company", "GlobalFoundries", "GM financial", "GoFundMe", "GPC", "Guardian Life", 
-        "Gulfstream", "Gusto", "Hewlett Packard Enterprise", "Hexagon AB", "Highmark Health", "Home Depot", 
-        "Honeywell", "HP IQ", "Hudl", "ibotta", "ICD", "ICF", "IDeaS", "Impel", "Ingredion", 
-        "Inmar Intelligence", "Inogen", "Innovative Systems", "Interactive Brokers", "Iron Mountain", 
-        "IXL Learning", "Johnson & Johnson", "Kensho", "Keysight Technologies", "Kingland", "Kitware", 
-        "Kodak", "LabCorp", "Lazard", "Lennox", "Lennox International", "LexisNexis Risk Solutions", 
-        "Live Oak Bank", "LKQ", "LPL Financial Holdings", "Lucid", "Manulife Financial", "Marathon Petroleum", 
-        "Marmon Holdings", "Marvell", "MasterControl", "McDonald's", "McNeilus", "Medline", "Medpace, Inc.", 
-        "MFS", "Micron Technology", "Midmark", "MKS Instruments", "Moloco", "Moody's", "Muon Space", 
-        "National Information Solutions Cooperative", "National Information Solutions Cooperative (NISC)", 
-        "Neighbor", "Nelnet", "Netsmart", "New York Life Insurance", "Newrez", "NextEra Energy", "Nextdoor", 
-        "Nicolet National Bank", "Nissan Global", "North Atlantic Industries", "Northmarq", "Nova-Tech", "Nutanix", 
-        "nVent", "Omnitech", "ONE Finance", "Ontario Teachers' Pension Plan", "Openlane", "Origami Risk", "Oshkosh", 
-        "Pacific Life", "Pella Corporation", "Pendo", "Philips", "Pierce Manufacturing", "PIMCO", "Plexus", 
-        "PrizePicks", "Qorvo", "Radiant", "Red Hat", "Regal Rexnord", "Relativity Space", "Rockwell Automation", 
-        "Samsara", "Santander", "Schweitzer Engineering Laboratories", "SciPlay", "Seagate", "Seagate Technology", 
-        "SeatGeek", "Semgrep", "SEP", "Seven Research", "SharkNinja", "Shure", "SICK", "Siemens", "Sigma Computing", 
-        "Solarity", "SpaceX", "Spectrum", "SPS Commerce", "Staples", "State Street", "State of Wisconsin Investment Board", 
-        "Steel Dynamics", "StoneX Group", "Stryker", "Symbotic", "Talos", "Tamr", "Tanium", "TC Energy", "TD Securities", 
-        "TEL", "Terex", "TetraMem", "Texas Instruments", "The Federal Reserve System", "The Toro Company", 
-        "The Voleon Group", "Thermo Fisher Scientific", "Thrivent", "Tokyo Electron", "Tradeweb", "Trane Technologies", 
-        "Transcard Payments", "TransPerfect", "Trimble", "TruStage", "Truveta", "Tyler Technologies", "U.S. Venture", 
-        "Uline", "United Launch Alliance", "Universal Orlando Resort", "Vanguard", "Varian", "Vermeer", 
-        "Verizon Communications", "Viam", "Viavi Solutions", "Voloridge Health", "Voloridge Investment Management", 
-        "W.R. Berkley", "Walmart", "Wellmark", "Western & Southern Financial Group", "Wex", "WillowTree", 
-        "Wind River", "Xantium", "Xcimer Energy", "YugaByte", "Zeiss", "Zebra", "Zebra Technologies", 
-        "ZipRecruiter", "Zurn Elkay Water Solutions", "Zurn Elkay Water Solutions Corporation"
-    ],
-    "Tier 4: Visa Check Required": [
-        "Abridge", "Al Warren Oil Company", "Altruist", "Anduril", "Athelas", "Audax Group", "Babel Street", 
-        "Base Power", "Baseten", "Blockhouse", "Brilliant", "Candle", "CesiumAstro", "Circleback", "Cloudglue - YC", 
-        "Commure", "CTGT", "Cua (X25)", "Cuckoo Labs", "Darkhive", "Dayton Freight Lines", "Decagon", 
-        "Dev Technology Group", "EControls", "Elayne", "Ember", "Ember AI", "Empirical", "Eventual", 
-        "Fable Security", "Falcomm", "FleetWorks", "Fresco (F24)", "Garage (W24)", "GIMLET LABS", "Gimlet Labs", 
-        "Harmonic", "Hermeus", "Litify", "Lunar Energy", "Martin's Famous Pastry Shoppe, Inc.", "N1", "Netic", 
-        "Numeric", "Oklahoma City Thunder", "Persona", "Promptless", "QuantCo", "Readily (S23)", "Reacher", 
-        "Reframe Systems", "Relixir", "Relixir (X25)", "Replit", "RESPEC", "Rilla", "SIFT", "Stack Auth", 
-        "Suno", "ThirdLayer", "ThirdLayer- YC(W25)", "Triple", "Upsolve", "Vast", "VAST", "WhatNot", 
-        "Whatnot", "YouLearn - YC"
-    ],
-    "Tier 5: Citizenship Required": [
-        "BAE Systems", "CACI", "Expedition Technology", "General Dynamics Mission Systems", 
-        "Innovative Defense Technologies (IDT)", "KBR", "L3Harris", "L3Harris Technologies", "Leidos", 
-        "Leonardo DRS", "MITRE", "Northrop Grumman", "Palantir", "Parsons", "Peraton", "RTX", 
-        "Sierra Nevada Coporation", "The Aerospace Corporation"
-    ]
-}
-
-# 1. CSV 파일 읽기 및 티어 분류
-company_to_tier = {company.strip(): tier for tier, companies in tier_map.items() for company in companies}
-try:
-    df = pd.read_csv('csv_files/merged_jobs.csv')
-except FileNotFoundError:
-    print("오류: 'merged_jobs.csv' 파일을 찾을 수 없습니다.")
-    exit()
+import jobs_io
+import metrics
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 티어 분류 목록 파일 (수정되면 다음 호출 때 자동으로 다시 읽음)
+DEFAULT_TIER_MAP = os.path.join(BASE_DIR, 'tier_map.json')
+UNCLASSIFIED = "Unclassified"
+
+def normalize_company(name):
+    # 대소문자와 중복 공백 차이를 무시하고 정확히 일치하는 이름을 찾기 위한 키
+    return ' '.join(name.split()).casefold()
+
+def build_company_trie(names):
+    # 문자 단위 트라이: '' 키에 해당 위치에서 끝나는 회사 이름을 저장
+    root = {}
+    for name in names:
+        node = root
+        for ch in name:
+            node = node.setdefault(ch, {})
+        node[''] = name
+    return root
+
+class TierIndex:
+    """
+    Company -> tier lookup built from a tier map ({tier: [company, ...]}).
+
+    Normalized exact names are tried first, then the longest tier-map name
+    contained in the company string (found with a character trie). Results
+    are memoized per company string.
+    """
+
+    def __init__(self, tier_map):
+        self.tier_map = tier_map
+        # 생성할 탭(시트)의 순서: 티어 목록 순서 + Unclassified
+        self.ordered_tiers = list(tier_map) + [UNCLASSIFIED]
+        self.company_to_tier = {company.strip(): tier for tier, companies in tier_map.items() for company in companies}
+        self.normalized_to_tier = {normalize_company(company): tier for company, tier in self.company_to_tier.items()}
+        self.company_trie = build_company_trie(self.company_to_tier)
+        self._memo = {}
+
+    def longest_known_company(self, text):
+        """Returns the longest tier-map name contained in text (earliest one on ties), or None."""
+        best = None
+        for start in range(len(text)):
+            node = self.company_trie
+            for i in range(start, len(text)):
+                node = node.get(text[i])
+                if node is None:
+                    break
+                name = node.get('')
+                if name is not None and (best is None or len(name) > len(best)):
+                    best = name
+        return best
+
+    def get_tier(self, company_name):
+        if not isinstance(company_name, str): return UNCLASSIFIED
+        tier = self._memo.get(company_name)
+        if tier is None:
+            clean_company_name = company_name.strip()
+            tier = self.normalized_to_tier.get(normalize_company(clean_company_name))
+            if not tier:
+                company = self.longest_known_company(clean_company_name)
+                tier = self.company_to_tier[company] if company else UNCLASSIFIED
+            self._memo[company_name] = tier
+        return tier
+
+_index = None
+_index_source = None
+
+def get_tier_index(tier_map_path=DEFAULT_TIER_MAP):
+    """
+    Returns the process-wide TierIndex for tier_map_path, building it on
+    first use and rebuilding it only when the file's mtime changes.
+    """
+    global _index, _index_source
+    source = (os.path.abspath(tier_map_path), os.stat(tier_map_path).st_mtime_ns)
+    if _index is None or _index_source != source:
+        with open(tier_map_path, 'r', encoding='utf-8') as f:
+            _index = TierIndex(json.load(f))
+        _index_source = source
+    return _index
 
 def get_tier(company_name):
-    if not isinstance(company_name, str): return "Unclassified"
-    clean_company_name = company_name.strip()
-    if clean_company_name in company_to_tier: return company_to_tier[clean_company_name]
-    for company, tier in company_to_tier.items():
-        if company in clean_company_name: return tier
-    return "Unclassified"
-
-df['Tier'] = df['Company'].apply(get_tier)
-print("모든 직무에 대한 티어 분류를 완료했습니다.")
-
-# 2. 엑셀 파일로 저장 (순서 지정)
-output_filename = 'csv_files/jobs_by_tier.xlsx'
-writer = pd.ExcelWriter(output_filename, engine='openpyxl')
-
-# 생성할 탭(시트)의 순서를 직접 지정
-ordered_tiers = [
-    "Tier 1: Top-Tier / Reach",
-    "Tier 2: Strongly Possible / Target",
-    "Tier 3: Possible / Foundation",
-    "Tier 4: Visa Check Required",
-    "Tier 5: Citizenship Required",
-    "Unclassified"
-]
-
-for tier in ordered_tiers:
-    # 각 티어에 해당하는 데이터만 필터링
-    tier_df = df[df['Tier'] == tier]
-    
-    # 해당 티어에 데이터가 있을 경우에만 시트를 생성
-    if not tier_df.empty:
-        # 시트 이름으로 사용하기 위해 특수문자 제거 및 길이 제한
-        sheet_name = re.sub(r'[:/]', '-', tier)[:31]
-        
-        tier_df.to_excel(writer, sheet_name=sheet_name, index=False)
-        print(f"'{sheet_name}' 탭을 생성했습니다.")
-
-# 엑셀 파일 저장 및 완료
-writer.close()
-print(f"✅ 완료! '{output_filename}' 파일에 모든 티어가 순서대로 저장되었습니다.")
\ No newline at end of file
+    return get_tier_index().get_tier(company_name)
+
+def _is_frame(jobs):
+    return hasattr(jobs, 'columns') and hasattr(jobs, 'groupby')
+
+def classify_jobs(rows_or_path, tier_map_path=DEFAULT_TIER_MAP):
+    """
+    Adds a 'Tier' to every job.
+
+    Args:
+        rows_or_path: A list of row dicts (returned as the same list, each
+            dict with a 'Tier' key; pandas is not imported), a pandas
+            DataFrame (returned with a 'Tier' column), or the path of a job
+            list file (CSV/Parquet/Arrow, loaded into a DataFrame).
+        tier_map_path (str): Tier map JSON file (default: tier_map.json).
+    """
+    index = get_tier_index(tier_map_path)
+    if isinstance(rows_or_path, (str, os.PathLike)):
+        rows_or_path = jobs_io.read_frame(rows_or_path)
+
+    if _is_frame(rows_or_path):
+        df = rows_or_path
+        # 같은 회사는 한 번만 계산하고 결과를 전체 열에 매핑
+        unique_tiers = {company: index.get_tier(company) for company in df['Company'].unique()}
+        df['Tier'] = df['Company'].map(unique_tiers).astype(object).fillna(UNCLASSIFIED)
+        return df
+
+    rows = rows_or_path if isinstance(rows_or_path, list) else list(rows_or_path)
+    for row in rows:
+        row['Tier'] = index.get_tier(row.get('Company'))
+    return rows
+
+def partition_by_tier(jobs):
+    """
+    Splits classified jobs by tier in a single pass.
+
+    Returns:
+        tuple: (column names, {tier: list of value lists}); empty cells are None.
+    """
+    groups = {}
+    if _is_frame(jobs):
+        import pandas as pd
+
+        columns = list(jobs.columns)
+        for tier, group in jobs.groupby('Tier', sort=False):
+            # 빈 값(NaN)은 셀을 비워 두도록 None으로 변환
+            groups[tier] = [[None if pd.isna(v) else v for v in values]
+                            for values in group.itertuples(index=False, name=None)]
+        return columns, groups
+
+    columns = []
+    for row in jobs:
+        for name in row:
+            if name not in columns:
+                columns.append(name)
+    for row in jobs:
+        # CSV에서 읽은 빈 문자열도 빈 셀로 기록
+        groups.setdefault(row['Tier'], []).append([row.get(name) if row.get(name) != '' else None for name in columns])
+    return columns, groups
+
+def sheet_name_for(tier):
+    # 시트 이름으로 사용하기 위해 특수문자 제거 및 길이 제한
+    return re.sub(r'[:/]', '-', tier)[:31]
+
+def write_tier_workbook(columns, groups, ordered_tiers, output_filename):
+    """Writes one sheet per non-empty tier with openpyxl's constant-memory write-only workbook."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    workbook = Workbook(write_only=True)
+    for tier in ordered_tiers:
+        records = groups.get(tier)
+
+        # 해당 티어에 데이터가 있을 경우에만 시트를 생성
+        if records:
+            sheet_name = sheet_name_for(tier)
+            sheet = workbook.create_sheet(sheet_name)
+            header = []
+            for name in columns:
+                cell = WriteOnlyCell(sheet, value=name)
+                cell.font = Font(bold=True)
+                header.append(cell)
+            sheet.append(header)
+            for record in records:
+                sheet.append(record)
+            print(f"'{sheet_name}' 탭을 생성했습니다.")
+
+    # 엑셀 파일 저장 및 완료
+    workbook.save(output_filename)
+    print(f"✅ 완료! '{output_filename}' 파일에 모든 티어가 순서대로 저장되었습니다.")
+
+def write_tier_files(columns, groups, ordered_tiers, split_dir, split_format='csv'):
+    """Writes one CSV/Parquet/Arrow file per non-empty tier into split_dir."""
+    os.makedirs(split_dir, exist_ok=True)
+    ext = jobs_io.FORMAT_EXTENSIONS[split_format]
+    for tier in ordered_tiers:
+        records = groups.get(tier)
+        if not records:
+            continue
+        path = os.path.join(split_dir, sheet_name_for(tier) + ext)
+        rows = (dict(zip(columns, record)) for record in records)
+        count = jobs_io.write_rows(rows, path, columns, split_format)
+        print(f"'{path}' 파일에 {count}개 행을 저장했습니다.")
+    print(f"✅ 완료! 티어별 파일을 '{split_dir}' 폴더에 저장했습니다.")
+
+def main():
+    parser = argparse.ArgumentParser(description='Classify merged jobs into company tiers and write one sheet per tier.')
+    parser.add_argument('input', nargs='?', default='csv_files/merged_jobs.csv',
+                        help='Merged job list: CSV, or Parquet/Arrow for a near zero-copy load (default: csv_files/merged_jobs.csv).')
+    parser.add_argument('-o', '--output', default='csv_files/jobs_by_tier.xlsx', help='Excel workbook path.')
+    parser.add_argument('--tier-map', default=DEFAULT_TIER_MAP, help='Tier map JSON file (default: tier_map.json).')
+    parser.add_argument('--no-excel', action='store_true', help='Skip the workbook (e.g. when only --split-dir output is needed).')
+    parser.add_argument('--split-dir', help='Also write one file per tier into this directory.')
+    parser.add_argument('--split-format', choices=('csv', 'parquet', 'arrow'), default='csv',
+                        help='Format of the per-tier files (default: csv).')
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+
+    run_stats = metrics.RunStats('classify.py')
+    with metrics.profiling(args.profile):
+        run(args, run_stats)
+    if args.stats_json:
+        run_stats.write_json(args.stats_json)
+
+def run(args, run_stats):
+    # 1. 파일 읽기 및 티어 분류
+    with run_stats.stage('read') as stage:
+        try:
+            df = jobs_io.read_frame(args.input)
+        except FileNotFoundError:
+            print(f"오류: '{args.input}' 파일을 찾을 수 없습니다.")
+            exit()
+        stage['rows_out'] = len(df)
+
+    with run_stats.stage('classify', len(df)) as stage:
+        df = classify_jobs(df, args.tier_map)
+        # 한 번의 groupby로 티어별 행을 나눔 (티어마다 전체를 다시 훑지 않음)
+        columns, groups = partition_by_tier(df)
+        stage['rows_out'] = len(df)
+    print("모든 직무에 대한 티어 분류를 완료했습니다.")
+    ordered_tiers = get_tier_index(args.tier_map).ordered_tiers
+
+    # 2. 엑셀 파일로 저장 (순서 지정, 쓰기 전용 모드로 메모리 사용을 일정하게 유지)
+    if not args.no_excel:
+        with run_stats.stage('workbook', len(df)) as stage:
+            write_tier_workbook(columns, groups, ordered_tiers, args.output)
+            stage['rows_out'] = len(df)
+
+    # 3. 티어별 파일 저장 (대용량에서 엑셀이 병목일 때)
+    if args.split_dir:
+        with run_stats.stage('split files', len(df)) as stage:
+            write_tier_files(columns, groups, ordered_tiers, args.split_dir, args.split_format)
+            stage['rows_out'] = len(df)
+
+if __name__ == '__main__':
+    main()
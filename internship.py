@@ -5,21 +5,76 @@ parse_jobs.py
 Usage:
   python parse_jobs.py input.txt -o software_jobs.csv
   cat input.txt | python parse_jobs.py - -o software_jobs.csv
+  python parse_jobs.py huge_dump.md --stream -o software_jobs.csv
+  python parse_jobs.py "snapshots/*.md" -j 8 -o software_jobs.csv
+  python parse_jobs.py a.md b.md --output-dir parsed/
 
 This extracts rows whose Role matches software-related keywords,
 removes utm_source from the job link, filters out Canada locations,
-formats dates (e.g., 'Sep 24', '3d') to YYYY-MM-DD (with current year),
+formats dates (e.g., 'Sep 24', '3d') to YYYY-MM-DD (relative to today, or
+to a fixed --as-of date so historical snapshots are reproducible),
 and writes a CSV with:
-Company, Role, Date Posted, Location, Link
+Company, Role, Date Posted, Location, Link, Fingerprint
+(Fingerprint is a hash of the canonical link, see links.py)
+as CSV, or as Parquet/Arrow with --format or a .parquet/.arrow output name.
+
+With --stream the input is never loaded as a whole: the table format is
+sniffed from the first SNIFF_LIMIT characters and rows flow through
+parse -> filter -> postprocess -> CSV one at a time.
+
+Several inputs (or glob patterns) are parsed in parallel with a process
+pool. Their rows are merged into one CSV in input order, or written to one
+CSV per input with --output-dir.
+
+With --cache FILE, parse results are stored by content hash: an input seen
+before (same content, keywords and engine) is not parsed again, and a
+changed input only re-parses the row blocks that changed. Workers can
+share one cache file, and the entries of an input's superseded versions
+are pruned.
+
+--stats-json FILE writes per-stage timings (parse, postprocess and write
+are timed separately also when rows stream through them, and summed over
+pool workers), row counts, the number of rows dropped by each filter and
+peak RSS as JSON; --profile FILE dumps a
+cProfile of the run (see metrics.py).
 """
 from datetime import date, datetime, timedelta # <<< timedelta 임포트 추가
 from dateutil.relativedelta import relativedelta
 import re
-import csv
 import sys
 import argparse
+import contextlib
+import itertools
+import html
+import functools
+import glob
+import os
+import io
+import json
+import zlib
+import hashlib
+import sqlite3
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
 from bs4 import BeautifulSoup
+from links import link_fingerprint
+import jobs_io
+import metrics
+
+# --stream 모드에서 형식 판별에 사용하는 앞부분 크기 (문자 수)
+SNIFF_LIMIT = 64 * 1024
+
+# 필터별로 걸러진 행 수 (keyword_miss, missing_link, emoji_excluded, country_excluded)
+drop_counts = Counter()
+# 단계별 누적 시간과 행 수 (스트리밍 중에도 parse/postprocess/write를 나눠서 측정)
+stage_clock = metrics.StageClock()
+
+DEFAULT_KEYWORDS = [
+    'software engineer', 'software dev', 'developer', 'swe', 'sde', 'r&d software',
+    'application engineer', 'firmware', 'embedded', 'systems engineer',
+    'backend', 'frontend', 'full stack', 'full-stack', 'data engineer'
+]
 
 def strip_html_tags(s: str) -> str:
     if not s:
@@ -27,13 +82,52 @@ def strip_html_tags(s: str) -> str:
     s = re.sub(r'<br\s*/?>', ', ', s, flags=re.IGNORECASE)
     return re.sub(r'<[^>]+>', '', s).strip()
 
-def extract_href(s: str) -> str:
-    if not s:
-        return ''
+# <a ...> 시작 태그와 그 안의 속성들 (따옴표로 감싼 값만 빠른 경로에서 처리)
+_A_OPEN_RE = re.compile(r'<a(?=[\s>/])', re.IGNORECASE)
+_A_TAG_RE = re.compile(
+    r'<a((?:\s+[^\s"\'<>/=]+(?:\s*=\s*(?:"[^"]*"|\'[^\']*\'))?)*)\s*/?>',
+    re.IGNORECASE,
+)
+_ATTR_RE = re.compile(r'\s+([^\s"\'<>/=]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'))?')
+# 이 표시가 <a> 앞에 있으면 BeautifulSoup과 결과가 달라질 수 있음
+_SOUP_ONLY_MARKERS = ('<!', '<script', '<style')
+# <a 앞부분이 텍스트와 완결된 태그로만 이뤄졌는지 (따옴표 속 값 포함) 확인
+_CLOSED_PREFIX_RE = re.compile(r'(?:[^<]|</?[a-zA-Z][^<>"\']*(?:(?:"[^"]*"|\'[^\']*\')[^<>"\']*)*>)*')
+
+def _extract_href_soup(s: str) -> str:
     soup = BeautifulSoup(s, 'html.parser')
     link_tag = soup.find('a')
     return link_tag['href'] if link_tag and link_tag.has_attr('href') else ''
 
+def extract_href(s: str) -> str:
+    """
+    Returns the href of the first <a> tag in a cell.
+
+    Handles the <a href="..."><img ...></a> shapes the upstream READMEs use
+    with precompiled regexes; anything else falls back to BeautifulSoup.
+    benchmark.py --hrefs checks the two against each other.
+    """
+    if not s:
+        return ''
+    start = _A_OPEN_RE.search(s)
+    prefix = (s[:start.start()] if start else s).lower()
+    if any(marker in prefix for marker in _SOUP_ONLY_MARKERS):
+        return _extract_href_soup(s)
+    # <a 앞에 닫히지 않은 '<'나 따옴표가 있으면 그 <a가 속성 값이나 다른 태그 안일 수 있음
+    if not _CLOSED_PREFIX_RE.fullmatch(prefix):
+        return _extract_href_soup(s)
+    if not start:
+        return ''
+    tag = _A_TAG_RE.match(s, start.start())
+    if not tag:
+        return _extract_href_soup(s)
+    hrefs = [m for m in _ATTR_RE.finditer(tag.group(1)) if m.group(1).lower() == 'href']
+    if not hrefs:
+        return ''
+    if len(hrefs) > 1:
+        return _extract_href_soup(s)
+    return html.unescape(hrefs[0].group(2) or hrefs[0].group(3) or '')
+
 def remove_utm_source(url: str) -> str:
     if not url:
         return ''
@@ -44,100 +138,512 @@ def remove_utm_source(url: str) -> str:
     cleaned = parsed._replace(query=new_query)
     return urlunparse(cleaned)
 
+class KeywordMatcher:
+    """
+    Matches role titles against include/exclude keyword lists.
+
+    Each list is compiled once into a single alternation regex (longest
+    keyword first), so matching a role costs one scan instead of one
+    substring test per keyword. With word_boundary=True a keyword only
+    matches as a whole word ('sde' no longer matches inside 'inside').
+    """
+
+    def __init__(self, keywords, exclude=(), word_boundary=False):
+        self.keywords = tuple(k.lower() for k in keywords)
+        self.exclude = tuple(k.lower() for k in exclude)
+        self.word_boundary = word_boundary
+        self._include_re = self._compile(self.keywords)
+        self._exclude_re = self._compile(self.exclude)
+
+    def _compile(self, words):
+        if not words:
+            return None
+        alternation = '|'.join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+        if self.word_boundary:
+            alternation = rf'(?<!\w)(?:{alternation})(?!\w)'
+        return re.compile(alternation)
+
+    def match(self, role_text: str):
+        """Returns the keyword found in role_text, or None if none matched or an exclude keyword did."""
+        r = role_text.lower()
+        if self._exclude_re and self._exclude_re.search(r):
+            return None
+        m = self._include_re.search(r) if self._include_re else None
+        return m.group() if m else None
+
+@functools.lru_cache(maxsize=32)
+def _cached_matcher(keywords):
+    return KeywordMatcher(keywords)
+
+def as_matcher(keywords) -> KeywordMatcher:
+    """Accepts a KeywordMatcher or a plain keyword list (compiled once and cached)."""
+    if isinstance(keywords, KeywordMatcher):
+        return keywords
+    return _cached_matcher(tuple(keywords))
+
 def is_software_role(role_text: str, keywords) -> bool:
-    r = role_text.lower()
-    for k in keywords:
-        if k in r:
-            return True
-    return False
+    return as_matcher(keywords).match(role_text) is not None
 
-def parse_markdown_table(text: str, keywords):
-    rows = []
-    last_company = ''
-    for raw in text.splitlines():
-        line = raw.strip()
-        if not line.startswith('|') or line.startswith('|-') or '---' in line:
-            continue
+def _markdown_cells(raw):
+    """Reads (company, role, location, link, date) from one table line, or None for other lines."""
+    line = raw.strip()
+    if not line.startswith('|') or line.startswith('|-') or '---' in line:
+        return None
+    
+    cols = [c.strip() for c in line.split('|')[1:-1]]
+    if len(cols) < 4:
+        return None
+    # 표의 헤더 행 (| Company | Role | ...)은 데이터 행이 아님
+    if cols[0].lower() == 'company' and cols[1].lower() == 'role':
+        return None
         
-        cols = [c.strip() for c in line.split('|')[1:-1]]
-        if len(cols) < 4:
+    company_cell, role_cell, location_cell, link_cell, *date_parts = cols
+    date_cell = date_parts[0] if date_parts else ''
+    return (
+        strip_html_tags(company_cell),
+        strip_html_tags(role_cell),
+        strip_html_tags(location_cell),
+        extract_href(link_cell),
+        date_cell,
+    )
+
+def _iter_markdown_rows(cell_rows, keywords):
+    keywords = as_matcher(keywords)
+    last_company = ''
+    for cells in cell_rows:
+        if cells is None:
             continue
-            
-        company_cell, role_cell, location_cell, link_cell, *date_parts = cols
-        date_cell = date_parts[0] if date_parts else ''
+        company_text, role, location, raw_link, date_cell = cells
 
-        company_text = strip_html_tags(company_cell)
         company = last_company if (company_text == '↳' or company_text == '') else company_text
         if company_text != '↳' and company_text != '':
             last_company = company_text
 
-        role = strip_html_tags(role_cell)
-        location = strip_html_tags(location_cell)
-        raw_link = extract_href(link_cell)
         clean_link = remove_utm_source(raw_link)
 
         if is_software_role(role, keywords):
-            rows.append({
+            yield {
                 'Company': company, 'Role': role, 'Date Posted': date_cell,
                 'Location': location, 'Link': clean_link
-            })
-    return rows
+            }
+        else:
+            drop_counts['keyword_miss'] += 1
 
-def parse_html_table(text: str, keywords):
-    rows = []
-    soup = BeautifulSoup(text, 'html.parser')
-    table_rows = soup.find_all('tbody')
+def iter_markdown_rows(lines, keywords):
+    """Yields matching rows from an iterable of lines, one at a time."""
+    return _iter_markdown_rows(map(_markdown_cells, lines), keywords)
+
+def parse_markdown_table(text: str, keywords):
+    return list(iter_markdown_rows(text.splitlines(), keywords))
+
+HTML_ENGINES = ('soup', 'lxml')
+
+def _soup_row_cells(row):
+    """Reference engine: reads the five cells of a BeautifulSoup <tr>."""
+    cols = row.find_all('td')
+    if len(cols) < 5:
+        return None
+
+    company_cell = cols[0]
+    role_cell = cols[1]
+    location_cell = cols[2]
+    link_cell = cols[3]
+    date_cell = cols[4]
+
+    raw_link_tag = link_cell.find('a')
+    raw_link = raw_link_tag['href'] if raw_link_tag and raw_link_tag.has_attr('href') else ''
+    return (
+        company_cell.get_text(strip=True),
+        role_cell.get_text(strip=True),
+        location_cell.get_text(separator=', ', strip=True),
+        raw_link,
+        date_cell.get_text(strip=True),
+    )
+
+def _lxml_row_cells(row):
+    """lxml engine: same output as _soup_row_cells for an lxml <tr> element."""
+    cols = list(row.iter('td'))
+    if len(cols) < 5:
+        return None
+
+    def texts(el):
+        return [t.strip() for t in el.itertext() if t.strip()]
+
+    raw_link_tag = next(cols[3].iter('a'), None)
+    raw_link = (raw_link_tag.get('href') or '') if raw_link_tag is not None else ''
+    return (
+        ''.join(texts(cols[0])),
+        ''.join(texts(cols[1])),
+        ', '.join(texts(cols[2])),
+        raw_link,
+        ''.join(texts(cols[4])),
+    )
+
+def _iter_html_rows(cell_rows, keywords):
+    keywords = as_matcher(keywords)
     last_company = ''
     
-    for tbody in table_rows:
-        for row in tbody.find_all('tr'):
-            cols = row.find_all('td')
-            if len(cols) < 5:
+    for cells in cell_rows:
+        if cells is None:
+            continue
+        company_text, role, location, raw_link, date = cells
+
+        if company_text == '' or '↳' in company_text:
+            company = last_company
+        else:
+            company = company_text
+            last_company = company_text
+
+        clean_link = remove_utm_source(raw_link)
+
+        if is_software_role(role, keywords):
+            yield {
+                'Company': company, 'Role': role, 'Date Posted': date,
+                'Location': location, 'Link': clean_link
+            }
+        else:
+            drop_counts['keyword_miss'] += 1
+
+def _iter_lxml_cells(chunks):
+    """
+    Feeds text chunks to lxml's incremental HTML parser and yields the cells
+    of each <tbody> row as soon as its </tr> is seen. Finished rows are
+    cleared and detached so the tree never holds more than one row.
+    """
+    try:
+        from lxml import etree
+    except ImportError:
+        print("Error: the 'lxml' engine requires lxml (pip install lxml).")
+        sys.exit(1)
+
+    parser = etree.HTMLPullParser(events=('end',), tag='tr')
+
+    def drain():
+        for _, row in parser.read_events():
+            ancestors = [a.tag for a in row.iterancestors()]
+            if 'tr' in ancestors:
+                # 중첩된 표의 행은 바깥 행과 함께 처리
                 continue
+            if 'tbody' in ancestors:
+                yield _lxml_row_cells(row)
+            row.clear()
+            parent = row.getparent()
+            if parent is not None:
+                while row.getprevious() is not None:
+                    del parent[0]
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+def parse_html_table(text: str, keywords, engine='soup'):
+    if engine == 'lxml':
+        return list(_iter_html_rows(_iter_lxml_cells([text]), keywords))
+    soup = BeautifulSoup(text, 'html.parser')
+    table_rows = (row for tbody in soup.find_all('tbody') for row in tbody.find_all('tr'))
+    return list(_iter_html_rows(map(_soup_row_cells, table_rows), keywords))
+
+_TR_OPEN_RE = re.compile(r'<tr[\s>]', re.IGNORECASE)
+_TR_CLOSE_RE = re.compile(r'</tr\s*>', re.IGNORECASE)
+_TBODY_RE = re.compile(r'<(/?)tbody[\s>]', re.IGNORECASE)
+
+def _update_tbody_state(fragment, in_tbody):
+    for m in _TBODY_RE.finditer(fragment):
+        in_tbody = not m.group(1)
+    return in_tbody
+
+def _iter_tr_strings(lines):
+    """Cuts the raw text of each <tbody> row out of a line stream."""
+    buf = ''
+    in_tbody = False
+    for line in lines:
+        buf += line
+        while True:
+            start = _TR_OPEN_RE.search(buf)
+            if not start:
+                # 열린 <tr>이 없으면 버퍼를 비워 메모리를 일정하게 유지
+                in_tbody = _update_tbody_state(buf, in_tbody)
+                buf = ''
+                break
+            end = _TR_CLOSE_RE.search(buf, start.end())
+            if not end:
+                break
+            in_tbody = _update_tbody_state(buf[:start.start()], in_tbody)
+            if in_tbody:
+                yield buf[start.start():end.end()]
+            buf = buf[end.end():]
+
+def _iter_tr_blocks(lines):
+    """Parses each <tbody> row of a line stream on its own."""
+    for tr in _iter_tr_strings(lines):
+        yield BeautifulSoup(tr, 'html.parser').tr
+
+def iter_html_rows(lines, keywords, engine='soup'):
+    """Yields matching rows from HTML table lines, one <tr> at a time."""
+    if engine == 'lxml':
+        return _iter_html_rows(_iter_lxml_cells(lines), keywords)
+    return _iter_html_rows(map(_soup_row_cells, _iter_tr_blocks(lines)), keywords)
 
-            company_cell = cols[0]
-            role_cell = cols[1]
-            location_cell = cols[2]
-            link_cell = cols[3]
-            date_cell = cols[4]
-
-            company_text = company_cell.get_text(strip=True)
-            if company_text == '' or '↳' in company_text:
-                company = last_company
-            else:
-                company = company_text
-                last_company = company_text
-
-            role = role_cell.get_text(strip=True)
-            location = location_cell.get_text(separator=', ', strip=True)
-            
-            raw_link_tag = link_cell.find('a')
-            raw_link = raw_link_tag['href'] if raw_link_tag and raw_link_tag.has_attr('href') else ''
-            clean_link = remove_utm_source(raw_link)
-            
-            date = date_cell.get_text(strip=True)
-
-            if is_software_role(role, keywords):
-                rows.append({
-                    'Company': company, 'Role': role, 'Date Posted': date,
-                    'Location': location, 'Link': clean_link
-                })
+# 캐시 형식이나 파싱 결과가 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 4
+# 내용 기반 블록 분할: 평균 블록 크기와 최대 블록 크기 (행 단위)
+CACHE_BLOCK_AVG = 64
+CACHE_BLOCK_MAX = 512
+
+class ParseCache:
+    """
+    On-disk (SQLite) store of parse results keyed by content hashes.
+
+    Two kinds of entries are kept: the extracted rows of a whole input,
+    keyed by the hash of its content plus the keyword/engine config, and
+    the cells of individual row blocks, keyed by the hash of the block
+    text, so a changed input only re-parses the blocks that changed.
+
+    The database runs in WAL mode in autocommit, so every write is its own
+    short transaction and process pool workers sharing one cache file do
+    not hold the lock while they parse. The latest version of each input
+    is recorded by name; when an input changes, the entries only its old
+    version used are deleted, so the cache does not grow with every poll.
+    Which blocks a whole-file entry uses is kept in its own table, so
+    pruning never loads the cached rows.
+    """
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS sources (name TEXT PRIMARY KEY, file_key TEXT NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS sources_file_key ON sources (file_key)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS file_blocks (file_key TEXT NOT NULL, block_key TEXT NOT NULL, "
+                          "PRIMARY KEY (file_key, block_key)) WITHOUT ROWID")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS file_blocks_block_key ON file_blocks (block_key)")
+        self.block_hits = 0
+        self.block_misses = 0
+
+    def get(self, key):
+        row = self.conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?)",
+                          (key, json.dumps(value, ensure_ascii=False)))
+
+    def put_file(self, file_key, rows, block_keys):
+        """Stores the rows of a whole input together with the keys of the blocks it was parsed from."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.put(file_key, rows)
+            conn.executemany("INSERT OR IGNORE INTO file_blocks VALUES (?, ?)",
+                             [(file_key, key) for key in dict.fromkeys(block_keys)])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def record_source(self, name, file_key):
+        """
+        Records file_key as the latest version of input name and deletes
+        the previous version's whole-file entry and the block entries that
+        no input's latest version uses any more.
+        """
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            old = conn.execute("SELECT file_key FROM sources WHERE name = ?", (name,)).fetchone()
+            conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?)", (name, file_key))
+            if old and old[0] != file_key:
+                stale = old[0]
+                still_live = conn.execute("SELECT 1 FROM sources WHERE file_key = ?", (stale,)).fetchone()
+                if not still_live:
+                    # 다른 입력의 최신 버전이 쓰지 않는 블록만 삭제 (행 데이터는 읽지 않음)
+                    conn.execute("""
+                        DELETE FROM entries WHERE key IN (
+                            SELECT b.block_key FROM file_blocks b
+                            WHERE b.file_key = ?1 AND NOT EXISTS (
+                                SELECT 1 FROM file_blocks o JOIN sources s ON s.file_key = o.file_key
+                                WHERE o.block_key = b.block_key AND o.file_key != ?1))
+                    """, (stale,))
+                    conn.execute("DELETE FROM entries WHERE key = ?", (stale,))
+                    conn.execute("DELETE FROM file_blocks WHERE file_key = ?", (stale,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        self.conn.close()
+
+def _content_key(*parts):
+    return hashlib.sha256('\x00'.join(parts).encode('utf-8')).hexdigest()
+
+def _iter_content_blocks(units):
+    """
+    Groups units (lines or <tr> strings) into content-defined blocks: a
+    block ends after a unit whose hash hits a fixed pattern, so inserting
+    rows at the top of a table only changes the blocks around the insert.
+    """
+    block = []
+    for unit in units:
+        block.append(unit)
+        if len(block) >= CACHE_BLOCK_MAX or zlib.crc32(unit.encode('utf-8')) % CACHE_BLOCK_AVG == 0:
+            yield block
+            block = []
+    if block:
+        yield block
+
+def _html_block_cells(block, engine):
+    if engine == 'lxml':
+        return list(_iter_lxml_cells(['<table><tbody>', *block, '</tbody></table>']))
+    return [_soup_row_cells(BeautifulSoup(tr, 'html.parser').tr) for tr in block]
+
+def _iter_cached_cells(units, parse_block, cache, kind, block_keys):
+    for block in _iter_content_blocks(units):
+        key = _content_key('block', str(CACHE_VERSION), kind, *block)
+        block_keys.append(key)
+        cells = cache.get(key)
+        if cells is None:
+            cache.block_misses += 1
+            cells = parse_block(block)
+            cache.put(key, cells)
+        else:
+            cache.block_hits += 1
+        yield from cells
+
+def parse_with_cache(f, keywords, engine, cache, name=None):
+    """
+    Returns the matching rows of an open input, reusing cached results.
+
+    An input whose content and config were seen before is answered from
+    the whole-file entry without parsing; otherwise only the row blocks
+    that are not in the cache are parsed.
+    """
+    prefix = f"[{name}] " if name else ''
+    # 이전 버전 정리를 위해 입력 파일 경로로 버전을 기록 (stdin은 제외)
+    source = getattr(f, 'name', None)
+    source = os.path.abspath(source) if isinstance(source, str) and not source.startswith('<') else None
+    if not f.seekable():
+        f = io.StringIO(f.read())
+
+    # 1차: 내용 해시 계산과 형식 판별 (원래 방식처럼 파일 전체에서 <thead> 확인)
+    digest = hashlib.sha256()
+    is_html = False
+    for line in f:
+        digest.update(line.encode('utf-8'))
+        if not is_html and '<thead>' in line.lower():
+            is_html = True
+    matcher = as_matcher(keywords)
+    config = json.dumps([CACHE_VERSION, engine, matcher.keywords, matcher.exclude, matcher.word_boundary])
+    file_key = _content_key('file', digest.hexdigest(), config)
+
+    entry = cache.get(file_key)
+    if entry is not None:
+        print(f"{prefix}Cache hit: reusing {len(entry)} parsed rows.")
+        if source:
+            cache.record_source(source, file_key)
+        return entry
+
+    f.seek(0)
+    block_keys = []
+    if is_html:
+        print(f"{prefix}HTML table format detected. Parsing changed blocks...")
+        cells = _iter_cached_cells(_iter_tr_strings(f), lambda block: _html_block_cells(block, engine),
+                                   cache, f'html:{engine}', block_keys)
+        rows = list(_iter_html_rows(cells, matcher))
+    else:
+        print(f"{prefix}Markdown pipe table format detected. Parsing changed blocks...")
+        cells = _iter_cached_cells(f, lambda block: [_markdown_cells(line) for line in block],
+                                   cache, 'markdown', block_keys)
+        rows = list(_iter_markdown_rows(cells, matcher))
+    # 전체 파일 항목에 사용한 블록 키도 함께 저장 (이전 버전 정리에 사용)
+    cache.put_file(file_key, rows, block_keys)
+    if source:
+        cache.record_source(source, file_key)
+    print(f"{prefix}Cache: reused {cache.block_hits} of {cache.block_hits + cache.block_misses} blocks.")
     return rows
 
-def postprocess_rows(rows):
-    processed = []
-    today = date.today()
-    current_year = today.year
+def split_row_units(text):
+    """
+    Splits a table into row units: its lines for Markdown, the raw <tbody>
+    <tr> strings for HTML. Returns (is_html, units).
+    """
+    is_html = '<thead>' in text.lower()
+    lines = text.splitlines(keepends=True)
+    return is_html, (list(_iter_tr_strings(lines)) if is_html else lines)
+
+def parse_row_units(units, is_html, engine='soup'):
+    """Returns the cells of each row unit (None for Markdown lines that are not table rows)."""
+    if is_html:
+        return _html_block_cells(units, engine) if units else []
+    return [_markdown_cells(unit) for unit in units]
+
+def rows_from_cells(cell_rows, is_html, keywords):
+    """Turns row cells (in table order, for '↳' rows) into the matching rows."""
+    if is_html:
+        return list(_iter_html_rows(cell_rows, keywords))
+    return list(_iter_markdown_rows(cell_rows, keywords))
+
+_DIGITS_RE = re.compile(r'\d+')
+
+@functools.lru_cache(maxsize=4096)
+def normalize_date(token: str, as_of: date) -> str:
+    """
+    Converts a 'Date Posted' token ('3d', '1mo', 'Sep 24') to YYYY-MM-DD,
+    relative to the as_of date. Unparseable and non-string tokens (e.g. NaN
+    from a blank CSV cell) are returned unchanged.
+
+    Results are cached per (token, as_of): a large table only has a few
+    hundred distinct tokens, so each one is parsed once.
+    """
+    if not isinstance(token, str):
+        return token
+    date_str = token.strip().lower()
+    
+    try:
+        if 'mo' in date_str:
+            months_ago = int(_DIGITS_RE.search(date_str).group())
+            past_date = as_of - relativedelta(months=months_ago)
+            return past_date.strftime("%Y-%m-%d")
+        elif 'd' in date_str:
+            days_ago = int(_DIGITS_RE.search(date_str).group())
+            past_date = as_of - timedelta(days=days_ago)
+            return past_date.strftime("%Y-%m-%d")
+        elif date_str:
+            # 'Sep 24'와 같은 형식 처리
+            dt = datetime.strptime(f"{date_str} {as_of.year}", "%b %d %Y")
+            return dt.strftime("%Y-%m-%d")
+    except (ValueError, AttributeError):
+        # 날짜 변환 실패 시 기존 값을 유지
+        pass
+    return token
+
+def normalize_date_column(tokens, as_of=None):
+    """
+    Normalizes a whole column, parsing each distinct token once. A pandas
+    Series gives a Series (same index), anything else a list.
+    """
+    as_of = as_of or date.today()
+    if hasattr(tokens, 'map') and hasattr(tokens, 'index'):
+        return tokens.map(lambda token: normalize_date(token, as_of))
+    return [normalize_date(token, as_of) for token in tokens]
+
+def iter_postprocess_rows(rows, as_of=None):
+    as_of = as_of or date.today()
     
     exclude_emojis = {'🛂', '🇺🇸', '🔒', '🎓'}
     all_emojis_to_clean = {'🛂', '🇺🇸', '🔒', '🔥', '🎓'}
 
     for r in rows:
         if not r.get('Link'):
+            drop_counts['missing_link'] += 1
             continue
+        r['Fingerprint'] = link_fingerprint(r['Link'])
 
         check_string = r.get('Company', '') + r.get('Role', '')
         if any(emoji in check_string for emoji in exclude_emojis):
+            drop_counts['emoji_excluded'] += 1
             continue
 
         for emoji in all_emojis_to_clean:
@@ -146,77 +652,248 @@ def postprocess_rows(rows):
 
         location_lower = r['Location'].lower()
         if any(country in location_lower for country in ['canada', ' uk', 'germany']):
+            drop_counts['country_excluded'] += 1
             continue
 
-        date_str = r['Date Posted'].strip().lower()
-        
-        try:
-            if 'mo' in date_str:
-                months_ago = int(re.search(r'\d+', date_str).group())
-                past_date = today - relativedelta(months=months_ago)
-                r['Date Posted'] = past_date.strftime("%Y-%m-%d")
-            # <<< --- 이 부분이 수정되었습니다 ---
-            elif 'd' in date_str:
-                days_ago = int(re.search(r'\d+', date_str).group())
-                past_date = today - timedelta(days=days_ago)
-                r['Date Posted'] = past_date.strftime("%Y-%m-%d")
-            # <<< --- 수정 끝 ---
-            elif date_str:
-                # 'Sep 24'와 같은 형식 처리
-                dt = datetime.strptime(f"{date_str} {current_year}", "%b %d %Y")
-                r['Date Posted'] = dt.strftime("%Y-%m-%d")
-        except (ValueError, AttributeError):
-            # 날짜 변환 실패 시 기존 값을 유지하거나 비워둘 수 있음
-            pass
+        r['Date Posted'] = normalize_date(r['Date Posted'], as_of)
         
-        processed.append(r)
-    return processed
+        yield r
+
+def postprocess_rows(rows, as_of=None):
+    return list(iter_postprocess_rows(rows, as_of))
+
+FIELDNAMES = ['Company', 'Role', 'Date Posted', 'Location', 'Link', 'Fingerprint']
 
 def write_csv(rows, outpath):
-    fieldnames = ['Company', 'Role', 'Date Posted', 'Location', 'Link']
-    with open(outpath, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    """Writes rows (a list or any iterable) to CSV and returns the row count."""
+    return write_output(rows, outpath, 'csv')
+
+def write_output(rows, outpath, fmt='auto'):
+    """Writes rows as CSV, Parquet or Arrow IPC (see jobs_io.py) and returns the row count."""
+    return jobs_io.write_rows(rows, outpath, FIELDNAMES, fmt)
+
+def sniff_format(lines, limit=SNIFF_LIMIT):
+    """
+    Looks at a bounded prefix of a line iterator to pick the table format.
+    Returns ('html' | 'markdown', lines) where lines replays the prefix.
+    """
+    lines = iter(lines)
+    head = []
+    size = 0
+    for line in lines:
+        head.append(line)
+        size += len(line)
+        if size >= limit:
+            break
+    fmt = 'html' if '<thead>' in ''.join(head).lower() else 'markdown'
+    return fmt, itertools.chain(head, lines)
+
+def open_input(path):
+    if path == '-':
+        return contextlib.nullcontext(sys.stdin)
+    return open(path, 'r', encoding='utf-8')
+
+def parse_rows(f, keywords, stream=False, engine='soup', name=None, cache=None):
+    """
+    Detects the table format of an open input and returns its raw (not yet
+    postprocessed) rows: a generator when streaming, otherwise a list.
+    With cache (path of a parse cache file) parsing goes through parse_with_cache.
+    """
+    prefix = f"[{name}] " if name else ''
+    if cache:
+        parse_cache = ParseCache(cache)
+        try:
+            return parse_with_cache(f, keywords, engine, parse_cache, name)
+        finally:
+            parse_cache.close()
+
+    if stream:
+        fmt, lines = sniff_format(f)
+        if fmt == 'html':
+            print(f"{prefix}HTML table format detected. Streaming...")
+            return iter_html_rows(lines, keywords, engine)
+        print(f"{prefix}Markdown pipe table format detected. Streaming...")
+        return iter_markdown_rows(lines, keywords)
+
+    text = f.read()
+    if '<thead>' in text.lower():
+        print(f"{prefix}HTML table format detected. Parsing...")
+        return parse_html_table(text, keywords, engine)
+    print(f"{prefix}Markdown pipe table format detected. Parsing...")
+    return parse_markdown_table(text, keywords)
+
+def extract_rows(f, keywords, stream=False, engine='soup', name=None, as_of=None, cache=None):
+    """
+    Detects the table format of an open input and yields processed rows.
+    The time spent parsing and postprocessing is added to stage_clock.
+    """
+    with stage_clock.running('parse'):
+        rows = parse_rows(f, keywords, stream, engine, name, cache)
+    if stream and not cache:
+        rows = stage_clock.iterate('parse', rows)
+        return stage_clock.iterate('postprocess', iter_postprocess_rows(rows, as_of))
+    stage_clock.count('parse', len(rows))
+    with stage_clock.running('postprocess'):
+        rows = postprocess_rows(rows, as_of)
+    stage_clock.count('postprocess', len(rows))
+    return rows
+
+def timed_write(rows, outpath, fmt='auto'):
+    """write_output() charged to the 'write' stage of stage_clock."""
+    with stage_clock.running('write'):
+        count = write_output(rows, outpath, fmt)
+    stage_clock.count('write', count)
+    return count
+
+def parse_file(path, keywords, engine='soup', cache=None):
+    """Process pool worker: parses one input file and returns its raw rows."""
+    with open_input(path) as f:
+        return list(parse_rows(f, keywords, engine=engine, name=path, cache=cache))
+
+def extract_file(path, keywords, stream=False, engine='soup', as_of=None, cache=None):
+    """Process pool worker: parses one input file and returns its rows."""
+    with open_input(path) as f:
+        return list(extract_rows(f, keywords, stream, engine, name=path, as_of=as_of, cache=cache))
+
+def extract_file_to_output(path, outpath, keywords, stream=False, engine='soup', as_of=None, cache=None, fmt='auto'):
+    """Process pool worker: parses one input file into its own output file."""
+    with open_input(path) as f:
+        rows = extract_rows(f, keywords, stream, engine, name=path, as_of=as_of, cache=cache)
+        return timed_write(rows, outpath, fmt)
+
+def map_inputs(fn, *iterables, workers=1, **kwargs):
+    """
+    Yields fn(*args, **kwargs) for each input in input order, spreading the
+    calls over a process pool when there is more than one input.
+    """
+    n_inputs = len(iterables[0])
+    if workers <= 1 or n_inputs <= 1:
+        yield from map(functools.partial(fn, **kwargs), *iterables)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, n_inputs)) as pool:
+        for result, drops, stages in pool.map(functools.partial(_counting_call, fn, **kwargs), *iterables):
+            drop_counts.update(drops)
+            stage_clock.merge(stages)
+            yield result
+
+def _counting_call(fn, *args, **kwargs):
+    # 작업 프로세스의 필터 통계와 단계별 시간을 결과와 함께 부모 프로세스로 돌려줌
+    drop_counts.clear()
+    stage_clock.reset()
+    result = fn(*args, **kwargs)
+    return result, dict(drop_counts), stage_clock.snapshot()
+
+def expand_inputs(patterns):
+    """Expands glob patterns (sorted, for a deterministic order) and keeps plain paths as given."""
+    paths = []
+    for pattern in patterns:
+        if pattern != '-' and any(c in pattern for c in '*?['):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                print(f"Error: No input files match '{pattern}'")
+                sys.exit(1)
+            paths.extend(matches)
+        else:
+            paths.append(pattern)
+    return paths
+
+def check_inputs(inputs):
+    """Exits with an error if an input file is missing or stdin is combined with other inputs."""
+    if '-' in inputs and len(inputs) > 1:
+        print("Error: stdin ('-') cannot be combined with other inputs.")
+        sys.exit(1)
+    for path in inputs:
+        if path != '-' and not os.path.isfile(path):
+            print(f"Error: Input file not found at '{path}'")
+            sys.exit(1)
+    return inputs
+
+def build_matcher(keywords=None, exclude_keywords=None, word_boundary=False):
+    """Builds the KeywordMatcher from comma-separated --keywords/--exclude-keywords values."""
+    if keywords:
+        keywords = [k.strip().lower() for k in keywords.split(',') if k.strip()]
+    else:
+        keywords = DEFAULT_KEYWORDS
+    exclude = [k.strip().lower() for k in (exclude_keywords or '').split(',') if k.strip()]
+    return KeywordMatcher(keywords, exclude, word_boundary=word_boundary)
 
 def main():
     parser = argparse.ArgumentParser(description='Extract software roles from markdown/HTML table and save CSV.')
-    parser.add_argument('input', help='Input file path or "-" for stdin')
+    parser.add_argument('input', nargs='+', help='Input file paths or glob patterns, or "-" for stdin')
     parser.add_argument('-o', '--output', default='software_jobs.csv', help='Output CSV path')
+    parser.add_argument('--format', choices=jobs_io.FORMATS, default='auto',
+                        help="Output format: csv, parquet or arrow (default: from the output file extension).")
+    parser.add_argument('--output-dir', help='Write one CSV per input into this directory instead of merging into --output.')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for multiple inputs (default: number of CPUs).')
     parser.add_argument('--keywords', help='Comma-separated keywords (case-insensitive). Overrides defaults.')
+    parser.add_argument('--exclude-keywords', help='Comma-separated keywords that reject a role even if a keyword matched.')
+    parser.add_argument('--word-boundary', action='store_true',
+                        help="Match keywords as whole words only (e.g. 'sde' no longer matches inside other words).")
+    parser.add_argument('--stream', action='store_true',
+                        help='Parse row by row without loading the whole input (format sniffed from a bounded prefix).')
+    parser.add_argument('--engine', choices=HTML_ENGINES, default='soup',
+                        help="HTML table engine: 'soup' (BeautifulSoup, reference) or 'lxml' (incremental, faster).")
+    parser.add_argument('--as-of', type=date.fromisoformat,
+                        help="Reference date (YYYY-MM-DD) for relative dates like '3d' (default: today).")
+    parser.add_argument('--cache',
+                        help='Parse cache file (SQLite, created if missing). Unchanged inputs are not re-parsed, '
+                             'changed ones only in the blocks that changed.')
+    metrics.add_arguments(parser)
     args = parser.parse_args()
 
-    try:
-        if args.input == '-':
-            text = sys.stdin.read()
-        else:
-            with open(args.input, 'r', encoding='utf-8') as f:
-                text = f.read()
-    except FileNotFoundError:
-        print(f"Error: Input file not found at '{args.input}'")
-        sys.exit(1)
+    run_stats = metrics.RunStats('internship.py')
+    with metrics.profiling(args.profile):
+        run(args, run_stats)
+    if args.stats_json:
+        run_stats.drops = dict(drop_counts)
+        run_stats.write_json(args.stats_json)
 
-    default_keywords = [
-        'software engineer', 'software dev', 'developer', 'swe', 'sde', 'r&d software',
-        'application engineer', 'firmware', 'embedded', 'systems engineer',
-        'backend', 'frontend', 'full stack', 'full-stack', 'data engineer'
-    ]
-    if args.keywords:
-        keywords = [k.strip().lower() for k in args.keywords.split(',') if k.strip()]
-    else:
-        keywords = default_keywords
+def run(args, run_stats):
+    matcher = build_matcher(args.keywords, args.exclude_keywords, args.word_boundary)
+    inputs = check_inputs(expand_inputs(args.input))
 
-    rows = []
-    if '<thead>' in text.lower():
-        print("HTML table format detected. Parsing...")
-        rows = parse_html_table(text, keywords)
+    options = dict(keywords=matcher, stream=args.stream, engine=args.engine, as_of=args.as_of,
+                   cache=args.cache)
+
+    if args.output_dir:
+        ext = jobs_io.FORMAT_EXTENSIONS.get(args.format, '.csv')
+        outputs = [
+            os.path.join(args.output_dir, ('stdin' if path == '-' else os.path.splitext(os.path.basename(path))[0]) + ext)
+            for path in inputs
+        ]
+        if len(set(outputs)) != len(outputs):
+            print("Error: Several inputs share a file name; they would overwrite each other in --output-dir.")
+            sys.exit(1)
+        os.makedirs(args.output_dir, exist_ok=True)
+        # 작업 프로세스 결과를 기다린 시간은 'wait' 단계로 따로 기록
+        counts = stage_clock.iterate('wait', map_inputs(extract_file_to_output, inputs, outputs,
+                                                        workers=args.workers, fmt=args.format, **options))
+        for outpath, count in zip(outputs, counts):
+            print(f'✅ Extracted {count} rows -> {outpath}')
+        record_stages(run_stats)
+        return
+
+    if len(inputs) == 1:
+        # 스트리밍이면 행이 파싱부터 기록까지 하나씩 흐르고, 시간은 단계별로 나눠서 누적
+        with open_input(inputs[0]) as f:
+            rows = extract_rows(f, **options)
+            count = timed_write(rows, args.output, args.format)
     else:
-        print("Markdown pipe table format detected. Parsing...")
-        rows = parse_markdown_table(text, keywords)
-    
-    processed_rows = postprocess_rows(rows)
-    write_csv(processed_rows, args.output)
-    print(f'✅ Extracted {len(processed_rows)} rows -> {args.output}')
+        batches = stage_clock.iterate('wait', map_inputs(extract_file, inputs, workers=args.workers, **options))
+        count = timed_write(itertools.chain.from_iterable(batches), args.output, args.format)
+    record_stages(run_stats)
+
+    print(f'✅ Extracted {count} rows -> {args.output}')
+
+def record_stages(run_stats):
+    """Adds the parse/postprocess/write times from stage_clock (summed over workers) to run_stats."""
+    rows = stage_clock.rows
+    for name, rows_in in (('parse', None), ('postprocess', rows.get('parse')),
+                          ('wait', None), ('write', rows.get('postprocess'))):
+        if name in stage_clock.seconds:
+            rows_out = None if name == 'wait' else rows.get(name, 0)
+            run_stats.add_stage(name, stage_clock.seconds[name], rows_in, rows_out)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
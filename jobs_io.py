@@ -0,0 +1,207 @@
+"""
+jobs_io.py
+
+Reads and writes job lists as CSV or as typed columnar files, shared by
+internship.py, merge_csv.py and classify.py.
+
+The columnar formats are Parquet (.parquet) and Arrow IPC (.arrow/.feather).
+'Company' and 'Location' are dictionary-encoded with one dictionary per file
+(batches only append new values to it, written as dictionary deltas), and
+'Date Posted' is stored as a real date column. Values that are not
+YYYY-MM-DD are kept as text in a 'Date Posted (text)' column, which the
+readers here fold back into 'Date Posted', so nothing is lost compared with
+CSV. Reading an Arrow IPC file memory-maps it, so loading the master list is
+close to zero-copy. They need pyarrow (pip install pyarrow); CSV works
+without it.
+"""
+import csv
+import itertools
+import os
+import re
+import sys
+from datetime import date
+
+FORMATS = ('auto', 'csv', 'parquet', 'arrow')
+EXTENSIONS = {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet',
+              '.arrow': 'arrow', '.feather': 'arrow', '.ipc': 'arrow'}
+FORMAT_EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}
+
+DICTIONARY_COLUMNS = ('Company', 'Location')
+DATE_COLUMNS = ('Date Posted',)
+# 날짜로 바꿀 수 없는 값은 이 접미사가 붙은 문자열 열에 원래 값 그대로 저장
+DATE_TEXT_SUFFIX = ' (text)'
+# 컬럼형 파일은 이 행 수만큼씩 나눠서 기록 (메모리 일정하게 유지)
+BATCH_ROWS = 65536
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+def detect_format(path, fmt='auto'):
+    """Returns 'csv', 'parquet' or 'arrow': fmt if given, else from the file extension (CSV by default)."""
+    if fmt and fmt != 'auto':
+        return fmt
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), 'csv')
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        print("Error: Parquet/Arrow files require pyarrow (pip install pyarrow).")
+        sys.exit(1)
+    return pyarrow
+
+def _schema(pa, fieldnames):
+    fields = []
+    for name in fieldnames:
+        if name in DICTIONARY_COLUMNS:
+            fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+        elif name in DATE_COLUMNS:
+            fields.append(pa.field(name, pa.date32()))
+            fields.append(pa.field(name + DATE_TEXT_SUFFIX, pa.string()))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+def _to_date(value):
+    if isinstance(value, date):
+        return value
+    # 정확히 YYYY-MM-DD인 값만 날짜로 저장 (그 외 ISO 표기는 원래 문자열로 남김)
+    if not isinstance(value, str) or not _ISO_DATE_RE.fullmatch(value):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+class _RunningDictionary:
+    """
+    Dictionary shared by every batch of one column. Each batch only appends
+    new values, so the IPC writer emits a delta instead of a replacement
+    (the IPC file format allows one dictionary per field).
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.values = []
+
+    def encode(self, pa, values):
+        indices = []
+        for value in values:
+            if value is None:
+                indices.append(None)
+                continue
+            i = self.index.get(value)
+            if i is None:
+                i = self.index[value] = len(self.values)
+                self.values.append(value)
+            indices.append(i)
+        return pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()),
+                                              pa.array(self.values, type=pa.string()))
+
+def _record_batch(pa, schema, rows, dictionaries):
+    arrays = []
+    for field in schema:
+        if field.name.endswith(DATE_TEXT_SUFFIX):
+            # 바로 앞의 날짜 열과 함께 채움
+            continue
+        values = [row.get(field.name) for row in rows]
+        if field.name in DATE_COLUMNS:
+            dates = [_to_date(v) for v in values]
+            arrays.append(pa.array(dates, type=pa.date32()))
+            arrays.append(pa.array([str(v) if d is None and v not in (None, '') else None
+                                    for v, d in zip(values, dates)], type=pa.string()))
+        elif pa.types.is_dictionary(field.type):
+            arrays.append(dictionaries.setdefault(field.name, _RunningDictionary()).encode(pa, values))
+        else:
+            arrays.append(pa.array(values, type=pa.string()))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def write_rows(rows, path, fieldnames, fmt='auto'):
+    """
+    Writes rows (dicts, any iterable) to path as CSV, Parquet or Arrow IPC.
+    Only the fieldnames columns are written; other keys are ignored.
+
+    Returns:
+        int: Number of rows written.
+    """
+    fmt = detect_format(path, fmt)
+    count = 0
+    if fmt == 'csv':
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    pa = _pyarrow()
+    schema = _schema(pa, fieldnames)
+    if fmt == 'parquet':
+        writer = pa.parquet.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+    dictionaries = {}
+    with writer:
+        rows = iter(rows)
+        while True:
+            batch = list(itertools.islice(rows, BATCH_ROWS))
+            if not batch:
+                break
+            writer.write_batch(_record_batch(pa, schema, batch, dictionaries))
+            count += len(batch)
+    return count
+
+def _read_table(pa, path, fmt):
+    if fmt == 'parquet':
+        return pa.parquet.read_table(path)
+    # Arrow IPC 파일은 메모리 매핑으로 복사 없이 읽음
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+def read_fieldnames(path, fmt='auto'):
+    """Returns the column names of a job list file ([] for an empty CSV)."""
+    fmt = detect_format(path, fmt)
+    if fmt == 'csv':
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            return csv.DictReader(f).fieldnames or []
+    pa = _pyarrow()
+    if fmt == 'parquet':
+        names = pa.parquet.read_schema(path).names
+    else:
+        names = pa.ipc.open_file(pa.memory_map(path, 'r')).schema.names
+    return [name for name in names if not name.endswith(DATE_TEXT_SUFFIX)]
+
+def iter_rows(path, fmt='auto'):
+    """Yields the rows of a job list file as dicts of strings, like csv.DictReader."""
+    fmt = detect_format(path, fmt)
+    if fmt == 'csv':
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+        return
+    pa = _pyarrow()
+    for batch in _read_table(pa, path, fmt).to_batches():
+        for row in batch.to_pylist():
+            for name in DATE_COLUMNS:
+                text = row.pop(name + DATE_TEXT_SUFFIX, None)
+                if text is not None:
+                    row[name] = text
+            yield {k: ('' if v is None else v.isoformat() if isinstance(v, date) else v)
+                   for k, v in row.items()}
+
+def read_frame(path, fmt='auto'):
+    """Loads a job list file into a pandas DataFrame (dictionary columns become categoricals)."""
+    import pandas as pd
+
+    fmt = detect_format(path, fmt)
+    if fmt == 'csv':
+        return pd.read_csv(path)
+    pa = _pyarrow()
+    df = _read_table(pa, path, fmt).to_pandas()
+    for name in DATE_COLUMNS:
+        text_name = name + DATE_TEXT_SUFFIX
+        if text_name in df.columns:
+            # 날짜가 아닌 원래 값을 다시 채워 넣음
+            text = df.pop(text_name)
+            if text.notna().any():
+                df[name] = df[name].astype(object).where(text.isna(), text)
+    return df
@@ -0,0 +1,65 @@
+"""
+links.py
+
+Canonical form and fingerprint of job application links, shared by
+internship.py and merge_csv.py.
+
+The same posting often shows up with different tracking parameters,
+parameter order, trailing slashes or http vs https. canonicalize_link()
+maps all of those to one string and link_fingerprint() hashes it into a
+compact fixed-width key used for deduplication.
+"""
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 제거할 추적용 쿼리 파라미터 (utm_* 는 접두사로 처리)
+TRACKING_PARAMS = {
+    'ref', 'ref_src', 'referrer', 'source_ref', 'gh_src', 'lever-source', 'lever-origin',
+    'fbclid', 'gclid', 'mc_cid', 'mc_eid', '_hsenc', '_hsmi', 'trk',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def canonicalize_link(url: str) -> str:
+    """
+    Returns the canonical form of a job link: https scheme, lowercase host
+    without 'www.' or a default port, no trailing slash, tracking params
+    dropped and the remaining query sorted.
+    """
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    original_scheme = parts.scheme.lower()
+    scheme = 'https' if original_scheme == 'http' else original_scheme
+
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port is None or str(port) == DEFAULT_PORTS.get(original_scheme) else f'{host}:{port}'
+
+    path = parts.path.rstrip('/')
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not is_tracking_param(k)
+    )
+    return urlunsplit((scheme, netloc, path, urlencode(query), parts.fragment))
+
+def fingerprint(text: str) -> str:
+    """Returns a 16-hex-digit (64-bit) BLAKE2b fingerprint of text ('' for empty text)."""
+    if not text:
+        return ''
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+def link_fingerprint(url: str) -> str:
+    """Returns the fingerprint of the canonical link ('' for no link)."""
+    if not url:
+        return ''
+    return fingerprint(canonicalize_link(url))
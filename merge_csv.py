@@ -3,61 +3,87 @@
 merge_csv.py
 
 Usage:
-  python merge_csv.py file1.csv file2.csv -o output.csv
+  python merge_csv.py file1.csv file2.csv [file3.csv ...] -o output.csv
+  python merge_csv.py snapshots/*.csv --partitions 64 -o output.csv
+  python merge_csv.py new_jobs.csv --store master.db
+  python merge_csv.py --store master.db -o master.csv
 
-This script merges two CSV files, removing duplicate rows based on a specified
-unique key column ('Link' by default).
+This script merges any number of CSV files, removing duplicate rows based on
+a specified unique key column ('Link' by default). Rows are streamed to the
+output; with --partitions the key set is split into on-disk hash partitions
+so it does not have to fit in memory.
+
+Rows are deduplicated on a fingerprint of the canonical link (see links.py),
+so the same posting with different tracking params, query order, trailing
+slash or http/https counts once. The Fingerprint column is added to the
+output; --raw-key dedups on the exact key value instead.
+
+Inputs and the output can also be typed columnar files (Parquet or Arrow
+IPC, see jobs_io.py), chosen by file extension or --format.
+
+With --store, rows are upserted into a SQLite master store with a unique
+index on the key column instead. Only the new batch is read, each key keeps
+its first-seen/last-seen timestamps, and the store is exported to CSV only
+when -o is given.
+
+--stats-json FILE and --profile FILE record timings, row counts and peak
+RSS of the run (see metrics.py).
 """
 import csv
+import re
 import sys
+import os
+import json
+import zlib
+import heapq
+import tempfile
+import contextlib
+import itertools
+import sqlite3
 import argparse
+from datetime import datetime
 
-def merge_unique_rows(file1_path, file2_path, key_column, output_path):
+from links import fingerprint, link_fingerprint
+import jobs_io
+import metrics
+
+FINGERPRINT_COLUMN = 'Fingerprint'
+# Fingerprint 열은 이 키 열(링크)의 지문
+LINK_COLUMN = 'Link'
+_FINGERPRINT_RE = re.compile(r'[0-9a-fA-F]{16}')
+
+def iter_input_rows(input_paths, key_column, stats):
     """
-    Merges unique rows from two CSV files into a new CSV file.
+    Yields the rows of the input files (CSV, Parquet or Arrow) in order,
+    one at a time.
 
     Args:
-        file1_path (str): Path to the first input CSV file.
-        file2_path (str): Path to the second input CSV file.
+        input_paths (list): Paths to the input files.
         key_column (str): The column name to use as a unique identifier.
-        output_path (str): Path for the output CSV file.
+        stats (dict): Filled with 'header' (from the first file that has one)
+            and 'total' (number of rows read).
     """
-    unique_rows = []
-    seen_keys = set()
-    header = []
-    
-    input_files = [file1_path, file2_path]
-    total_rows_processed = 0
-
-    print(f"Starting merge process. Unique key: '{key_column}'")
-
-    for file_path in input_files:
+    for file_path in input_paths:
         try:
-            with open(file_path, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                # 헤더가 비어있으면 건너뛰기
-                if not reader.fieldnames:
-                    print(f"Warning: '{file_path}' is empty or has no header. Skipping.")
-                    continue
-                
-                # 첫 번째 유효한 파일에서 헤더를 설정
-                if not header:
-                    header = reader.fieldnames
-                
-                # 키 컬럼이 파일에 있는지 확인
-                if key_column not in header:
-                    print(f"Error: Key column '{key_column}' not found in '{file_path}'.")
-                    sys.exit(1)
-                
-                for row in reader:
-                    total_rows_processed += 1
-                    key_value = row.get(key_column)
-                    
-                    # 키 값이 존재하고, 아직 처리된 적 없는 키라면 추가
-                    if key_value and key_value not in seen_keys:
-                        seen_keys.add(key_value)
-                        unique_rows.append(row)
+            fieldnames = jobs_io.read_fieldnames(file_path)
+            
+            # 헤더가 비어있으면 건너뛰기
+            if not fieldnames:
+                print(f"Warning: '{file_path}' is empty or has no header. Skipping.")
+                continue
+            
+            # 첫 번째 유효한 파일에서 헤더를 설정
+            if not stats['header']:
+                stats['header'] = fieldnames
+            
+            # 키 컬럼이 파일에 있는지 확인
+            if key_column not in stats['header']:
+                print(f"Error: Key column '{key_column}' not found in '{file_path}'.")
+                sys.exit(1)
+            
+            for row in jobs_io.iter_rows(file_path):
+                stats['total'] += 1
+                yield row
 
         except FileNotFoundError:
             print(f"Error: Input file not found at '{file_path}'")
@@ -65,48 +91,424 @@ def merge_unique_rows(file1_path, file2_path, key_column, output_path):
         except Exception as e:
             print(f"An error occurred while processing '{file_path}': {e}")
             sys.exit(1)
-            
-    # 고유한 행이 있을 경우에만 CSV 파일 작성
-    if unique_rows:
+
+def dedup_key(row, key_column, raw_key=False):
+    """
+    Returns the deduplication key of a row ('' if it has none).
+
+    By default this is a 16-hex-digit fingerprint. For the Link column it is
+    the canonical link fingerprint: the row's Fingerprint column if it holds
+    a valid one, otherwise one computed from the link (and stored on the
+    row so it is written out). For any other key column it is the
+    fingerprint of that column's value. With raw_key the key column is used
+    as is.
+    """
+    if raw_key:
+        return row.get(key_column) or ''
+    if key_column != LINK_COLUMN:
+        return fingerprint(row.get(key_column) or '')
+    stored = row.get(FINGERPRINT_COLUMN)
+    if isinstance(stored, str) and _FINGERPRINT_RE.fullmatch(stored):
+        return stored.lower()
+    # 지문 열이 없거나 잘못된 값이면 링크에서 다시 계산
+    link = row.get(key_column) or ''
+    row[FINGERPRINT_COLUMN] = link_fingerprint(link)
+    return row[FINGERPRINT_COLUMN]
+
+def with_fingerprint_column(header, key_column, raw_key=False):
+    """Returns header with the Fingerprint column appended when rows are keyed on the link fingerprint."""
+    header = list(header)
+    if not raw_key and key_column == LINK_COLUMN and FINGERPRINT_COLUMN not in header:
+        header.append(FINGERPRINT_COLUMN)
+    return header
+
+def dedup_in_memory(rows, key_column, raw_key=False):
+    """Yields each row whose key has not been seen yet, keeping every key in a set."""
+    seen_keys = set()
+    for row in rows:
+        key_value = dedup_key(row, key_column, raw_key)
+        if not key_value:
+            continue
+        # 지문은 64비트 정수로 보관해 집합을 작고 빠르게 유지
+        if not raw_key:
+            key_value = int(key_value, 16)
+        
+        # 키 값이 존재하고, 아직 처리된 적 없는 키라면 추가
+        if key_value not in seen_keys:
+            seen_keys.add(key_value)
+            yield row
+
+def dedup_partitioned(rows, key_column, partitions, raw_key=False):
+    """
+    Yields the same rows as dedup_in_memory, but only one partition's keys
+    are held in memory at a time.
+
+    Rows are spread over temporary partition files by a hash of their key,
+    each partition is deduplicated on its own, and the partition results
+    are merged back in input order.
+
+    Args:
+        rows (iterable): Input rows (dicts).
+        key_column (str): The column name to use as a unique identifier.
+        partitions (int): Number of hash partitions.
+        raw_key (bool): Deduplicate on the raw key column instead of the
+            link fingerprint.
+    """
+    with tempfile.TemporaryDirectory(prefix='merge_csv_') as tmp_dir, contextlib.ExitStack() as stack:
+        part_paths = [os.path.join(tmp_dir, f'part{i}.csv') for i in range(partitions)]
+        part_files = [stack.enter_context(open(p, 'w', newline='', encoding='utf-8')) for p in part_paths]
+        part_writers = [csv.writer(f) for f in part_files]
+
+        # 1단계: 키의 해시로 파티션을 나누고 입력 순서 번호를 함께 기록
+        for seq, row in enumerate(rows):
+            key_value = dedup_key(row, key_column, raw_key)
+            if not key_value:
+                continue
+            part = zlib.crc32(key_value.encode('utf-8')) % partitions
+            part_writers[part].writerow([seq, key_value, json.dumps(row, ensure_ascii=False)])
+        for f in part_files:
+            f.close()
+
+        # 2단계: 파티션마다 따로 중복 제거 (같은 키는 항상 같은 파티션에 있음)
+        unique_paths = []
+        for part_path in part_paths:
+            unique_path = part_path + '.unique'
+            seen_keys = set()
+            with open(part_path, 'r', newline='', encoding='utf-8') as src, \
+                    open(unique_path, 'w', newline='', encoding='utf-8') as dst:
+                writer = csv.writer(dst)
+                for record in csv.reader(src):
+                    if record[1] not in seen_keys:
+                        seen_keys.add(record[1])
+                        writer.writerow(record)
+            os.remove(part_path)
+            unique_paths.append(unique_path)
+
+        # 3단계: 각 파티션의 결과를 입력 순서 번호 기준으로 병합
+        readers = [csv.reader(stack.enter_context(open(p, 'r', newline='', encoding='utf-8')))
+                   for p in unique_paths]
+        for _, _, data in heapq.merge(*readers, key=lambda record: int(record[0])):
+            yield json.loads(data)
+
+def merge_unique_rows(input_paths, key_column, output_path, partitions=0, raw_key=False, fmt='auto', stats=None):
+    """
+    Merges unique rows from any number of job list files into a new file.
+
+    Rows are streamed to the output as soon as they are found to be unique;
+    the first occurrence of each key wins.
+
+    Args:
+        input_paths (list): Paths to the input files, in priority order.
+        key_column (str): The column name to use as a unique identifier.
+        output_path (str): Path for the output file.
+        partitions (int): If greater than 1, deduplicate through that many
+            on-disk hash partitions instead of one in-memory key set.
+        raw_key (bool): Deduplicate on the raw key column instead of the
+            fingerprint of its canonical link (see links.py).
+        fmt (str): Output format, 'csv', 'parquet' or 'arrow' ('auto' picks
+            it from the output file extension).
+        stats (dict): If given, filled with 'header' and 'total' (number of
+            rows read).
+
+    Returns:
+        int: Number of unique rows written.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(header=[], total=0)
+    rows = iter_input_rows(input_paths, key_column, stats)
+    if partitions > 1:
+        unique_rows = dedup_partitioned(rows, key_column, partitions, raw_key)
+    else:
+        unique_rows = dedup_in_memory(rows, key_column, raw_key)
+
+    print(f"Starting merge process. Unique key: '{key_column}'")
+
+    # 고유한 행이 하나라도 있을 때만 출력 파일을 생성
+    first_row = next(unique_rows, None)
+    unique_count = 0
+    if first_row is not None:
+        # 헤더는 첫 번째 파일의 헤더를 기준으로 사용 (지문 열은 항상 포함)
+        header = with_fingerprint_column(stats['header'], key_column, raw_key)
         try:
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                # 헤더는 첫 번째 파일의 헤더를 기준으로 사용
-                writer = csv.DictWriter(f, fieldnames=header)
-                writer.writeheader()
-                writer.writerows(unique_rows)
-            
-            print("-" * 30)
-            print(f"Total rows processed: {total_rows_processed}")
-            print(f"Unique rows found: {len(unique_rows)}")
-            print(f"✅ Successfully merged unique rows into '{output_path}'")
-            
-        except Exception as e:
+            unique_count = jobs_io.write_rows(itertools.chain([first_row], unique_rows), output_path, header, fmt)
+        except (OSError, ValueError) as e:
             print(f"An error occurred while writing to '{output_path}': {e}")
             sys.exit(1)
+
+    if unique_count:
+        print("-" * 30)
+        print(f"Total rows processed: {stats['total']}")
+        print(f"Unique rows found: {unique_count}")
+        print(f"✅ Successfully merged unique rows into '{output_path}'")
     else:
         print("No unique rows found to write.")
+    return unique_count
+
+
+def store_key_spec(key_column, raw_key=False):
+    # 저장소가 어떤 키로 만들어졌는지 기록하는 문자열
+    return key_column if raw_key else f'fingerprint({key_column})'
+
+def open_store(db_path, key_spec):
+    """
+    Opens (and creates if needed) the SQLite master store.
+
+    Args:
+        db_path (str): Path to the SQLite database file.
+        key_spec (str): What the unique key is, from store_key_spec().
+
+    Returns:
+        sqlite3.Connection: The open connection.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS jobs (
+            key TEXT NOT NULL UNIQUE,
+            data TEXT NOT NULL,
+            batch INTEGER NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL
+        );
+    """)
+    stored_key = conn.execute("SELECT value FROM meta WHERE name = 'key_column'").fetchone()
+    if stored_key is None:
+        conn.execute("INSERT INTO meta VALUES ('key_column', ?)", (key_spec,))
+        conn.commit()
+    elif stored_key[0] != key_spec:
+        print(f"Error: '{db_path}' is keyed on '{stored_key[0]}', not '{key_spec}'.")
+        sys.exit(1)
+    return conn
+
+def store_header(conn):
+    row = conn.execute("SELECT value FROM meta WHERE name = 'header'").fetchone()
+    return json.loads(row[0]) if row else []
+
+def init_store_header(conn, fieldnames, key_column, raw_key=False):
+    """Returns the store's header, setting it from fieldnames if the store has none yet."""
+    header = store_header(conn)
+    # 저장소의 헤더는 처음 들어온 파일의 헤더를 기준으로 사용
+    if not header:
+        header = with_fingerprint_column(fieldnames, key_column, raw_key)
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('header', ?)", (json.dumps(header),))
+    return header
+
+def next_batch(conn):
+    """Returns the next batch number, kept as a counter in meta (no scan of the jobs table)."""
+    row = conn.execute("SELECT value FROM meta WHERE name = 'batch'").fetchone()
+    if row is None:
+        # 카운터가 없던 이전 저장소: 한 번만 최댓값을 구해 카운터로 저장
+        last = conn.execute("SELECT COALESCE(MAX(batch), 0) FROM jobs").fetchone()[0]
+    else:
+        last = int(row[0])
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('batch', ?)", (str(last + 1),))
+    return last + 1
+
+def upsert_row(conn, row, key_column, batch, now, raw_key=False):
+    """
+    Inserts a row under a new key. A key already stored from an earlier batch
+    is replaced by the new row, like a merge where the new CSV wins: it moves
+    to this batch (in input order) and keeps its first_seen. Within one batch
+    the first occurrence of a key wins.
+
+    Returns:
+        bool: True if the key was new (rows without a key are skipped: False).
+    """
+    key_value = dedup_key(row, key_column, raw_key)
+    if not key_value:
+        return False
+    stored = conn.execute("SELECT batch, first_seen FROM jobs WHERE key = ?", (key_value,)).fetchone()
+    if stored is not None:
+        if stored[0] == batch:
+            return False
+        # 다시 넣어서 새 rowid를 받음: 내보낼 때 이번 배치 안에서 입력 순서를 유지
+        conn.execute("DELETE FROM jobs WHERE key = ?", (key_value,))
+    first_seen = stored[1] if stored is not None else now
+    conn.execute(
+        "INSERT INTO jobs (key, data, batch, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)",
+        (key_value, json.dumps(row, ensure_ascii=False), batch, first_seen, now),
+    )
+    return stored is None
+
+def upsert_into_store(input_paths, key_column, db_path, raw_key=False):
+    """
+    Upserts the rows of CSV files into the SQLite master store.
+
+    New keys are inserted with the current batch number and timestamp;
+    keys already in the store get the new row's data and the current batch
+    and keep their first_seen (see upsert_row). Every row costs a couple of
+    index lookups, so the cost depends on the size of the input files, not
+    on the size of the store.
+
+    Args:
+        input_paths (list): Paths to the input CSV files.
+        key_column (str): The column name to use as a unique identifier.
+        db_path (str): Path to the SQLite database file.
+        raw_key (bool): Key the store on the raw key column instead of the
+            link fingerprint.
+
+    Returns:
+        tuple: (rows processed, new rows inserted).
+    """
+    conn = open_store(db_path, store_key_spec(key_column, raw_key))
+    now = datetime.now().isoformat(timespec='seconds')
+    batch = next_batch(conn)
+    total_rows_processed = 0
+    new_rows = 0
+
+    print(f"Starting upsert into '{db_path}'. Unique key: '{key_column}'")
+
+    with conn:
+        for file_path in input_paths:
+            try:
+                fieldnames = jobs_io.read_fieldnames(file_path)
+
+                if not fieldnames:
+                    print(f"Warning: '{file_path}' is empty or has no header. Skipping.")
+                    continue
+
+                if key_column not in fieldnames:
+                    print(f"Error: Key column '{key_column}' not found in '{file_path}'.")
+                    sys.exit(1)
+
+                init_store_header(conn, fieldnames, key_column, raw_key)
+
+                for row in jobs_io.iter_rows(file_path):
+                    total_rows_processed += 1
+                    new_rows += upsert_row(conn, row, key_column, batch, now, raw_key)
+
+            except FileNotFoundError:
+                print(f"Error: Input file not found at '{file_path}'")
+                sys.exit(1)
+
+    conn.close()
+
+    print("-" * 30)
+    print(f"Total rows processed: {total_rows_processed}")
+    print(f"New rows added: {new_rows}")
+    print(f"✅ Store '{db_path}' is up to date")
+    return total_rows_processed, new_rows
+
+def export_store(db_path, key_column, output_path, with_timestamps=False, raw_key=False, fmt='auto'):
+    """
+    Writes the SQLite master store to a CSV (or Parquet/Arrow) file.
+
+    Rows from the newest batch come first, like a merge of a new CSV into
+    the master list; rows inside a batch keep their input order.
+
+    Args:
+        db_path (str): Path to the SQLite database file.
+        key_column (str): The column name used as the unique key.
+        output_path (str): Path for the output CSV file.
+        with_timestamps (bool): Add 'First Seen' and 'Last Seen' columns.
+        raw_key (bool): The store is keyed on the raw key column.
+        fmt (str): Output format ('auto' picks it from the file extension).
+
+    Returns:
+        int: Number of rows exported.
+    """
+    conn = open_store(db_path, store_key_spec(key_column, raw_key))
+    header = store_header(conn)
+    if not header:
+        print(f"No rows in '{db_path}' to export.")
+        conn.close()
+        return 0
+
+    fieldnames = header + ['First Seen', 'Last Seen'] if with_timestamps else header
+
+    def stored_rows():
+        for data, first_seen, last_seen in conn.execute(
+            "SELECT data, first_seen, last_seen FROM jobs ORDER BY batch DESC, rowid"
+        ):
+            row = json.loads(data)
+            # 저장소 헤더에 없는 열은 내보내지 않음
+            row = {name: row.get(name, '') for name in header}
+            if with_timestamps:
+                row['First Seen'] = first_seen
+                row['Last Seen'] = last_seen
+            yield row
+
+    count = jobs_io.write_rows(stored_rows(), output_path, fieldnames, fmt)
+    conn.close()
+    print(f"✅ Exported {count} rows from '{db_path}' into '{output_path}'")
+    return count
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Merge two CSV files and remove duplicates based on a key column.",
+        description="Merge CSV files and remove duplicates based on a key column.",
         formatter_class=argparse.RawTextHelpFormatter
     )
-    parser.add_argument('file1', help='Path to the first input CSV file.')
-    parser.add_argument('file2', help='Path to the second input CSV file.')
+    parser.add_argument(
+        'files', nargs='*',
+        help='Input CSV files, in priority order (the first occurrence of a key wins).\n'
+             'With --store the list may be empty to only export the store.'
+    )
     parser.add_argument(
         '-o', '--output', 
-        default='merged_unique_jobs.csv', 
-        help='Path for the output CSV file (default: merged_unique_jobs.csv).'
+        help='Path for the output CSV file (default: merged_unique_jobs.csv).\n'
+             'With --store, the store is exported here only if given.'
+    )
+    parser.add_argument(
+        '--format', choices=jobs_io.FORMATS, default='auto',
+        help='Output format: csv, parquet or arrow (default: from the output file extension).\n'
+             'Inputs may be CSV, Parquet (.parquet) or Arrow IPC (.arrow/.feather) files.'
     )
     parser.add_argument(
         '-k', '--key', 
         default='Link', 
         help="The column name to use for deduplication (default: 'Link')."
     )
+    parser.add_argument(
+        '--partitions', type=int, default=0,
+        help='Deduplicate through this many on-disk hash partitions to bound memory\n'
+             '(default: 0, one in-memory key set).'
+    )
+    parser.add_argument(
+        '--raw-key', action='store_true',
+        help='Deduplicate on the exact key column value instead of the fingerprint\n'
+             'of its canonical link (tracking params, query order, http/https ignored).'
+    )
+    parser.add_argument(
+        '--store',
+        help='SQLite master store to upsert the input files into (created if missing).'
+    )
+    parser.add_argument(
+        '--timestamps', action='store_true',
+        help="With --store, add 'First Seen' and 'Last Seen' columns to the export."
+    )
+    metrics.add_arguments(parser)
     args = parser.parse_args()
-    
-    merge_unique_rows(args.file1, args.file2, args.key, args.output)
+    if not args.store and not args.files:
+        parser.error('at least one input file is required without --store')
+    if args.store and not args.files and not args.output:
+        parser.error('nothing to do: give input files to upsert and/or -o to export the store')
+
+    run_stats = metrics.RunStats('merge_csv.py')
+    with metrics.profiling(args.profile):
+        run(args, run_stats)
+    if args.stats_json:
+        run_stats.write_json(args.stats_json)
+
+def run(args, run_stats):
+    if args.store:
+        if args.files:
+            with run_stats.stage('upsert') as stage:
+                stage['rows_in'], stage['rows_out'] = upsert_into_store(args.files, args.key, args.store, args.raw_key)
+        if args.output:
+            with run_stats.stage('export') as stage:
+                stage['rows_out'] = export_store(args.store, args.key, args.output, args.timestamps, args.raw_key,
+                                                 args.format)
+        return
+
+    with run_stats.stage('merge') as stage:
+        merge_stats = {}
+        stage['rows_out'] = merge_unique_rows(args.files, args.key, args.output or 'merged_unique_jobs.csv',
+                                              args.partitions, args.raw_key, args.format, merge_stats)
+        stage['rows_in'] = merge_stats['total']
+    # 중복 키와 키가 없는 행을 합친 수
+    run_stats.drops['duplicate_or_missing_key'] = stage['rows_in'] - stage['rows_out']
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
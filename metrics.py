@@ -0,0 +1,172 @@
+"""
+metrics.py
+
+Opt-in run instrumentation shared by internship.py, merge_csv.py,
+classify.py and pipeline.py.
+
+  --stats-json PATH   wall time and rows in/out per stage, per-filter drop
+                      counts and peak RSS, written as JSON
+  --profile PATH      cProfile dump of the run (open it with
+                      `python -m pstats PATH` or snakeviz); the top
+                      functions by cumulative time are also printed
+
+Stage timing is always on (it costs a perf_counter call per stage, or per
+row for stages that are generators chained into each other, see
+StageClock); the flags only decide what gets written.
+"""
+import contextlib
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+
+def peak_rss_mb(children=False):
+    """Peak resident set size of this process (or of its finished child processes) in MB, None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        # Windows에는 resource 모듈이 없음
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss 단위: Linux는 KB, macOS는 바이트
+    scale = 1e6 if sys.platform == 'darwin' else 1e3
+    return round(usage.ru_maxrss / scale, 2)
+
+class RunStats:
+    """Collects wall time and rows in/out per stage, plus named counters (e.g. filter drops)."""
+
+    def __init__(self, script):
+        self.script = script
+        self.stages = []
+        self.drops = {}
+        self.start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name, rows_in=None):
+        """Times the with-block; set record['rows_out'] (and adjust 'rows_in') inside it."""
+        record = {'stage': name, 'rows_in': rows_in, 'rows_out': None, 'seconds': 0.0}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self.stages.append(record)
+
+    def add_stage(self, name, seconds, rows_in=None, rows_out=None):
+        """Adds a stage measured elsewhere (e.g. by a StageClock)."""
+        self.stages.append({'stage': name, 'rows_in': rows_in, 'rows_out': rows_out, 'seconds': seconds})
+
+    def report(self):
+        total = sum(s['seconds'] for s in self.stages)
+        print("-" * 30)
+        print(f"{'stage':<12} {'rows in':>9} {'rows out':>9} {'seconds':>9} {'share':>6}")
+        for s in self.stages:
+            share = s['seconds'] / total if total else 0
+            rows_in = '-' if s['rows_in'] is None else s['rows_in']
+            rows_out = '-' if s['rows_out'] is None else s['rows_out']
+            print(f"{s['stage']:<12} {rows_in:>9} {rows_out:>9} {s['seconds']:>9.3f} {share:>6.0%}")
+        print(f"{'total':<12} {'':>9} {'':>9} {total:>9.3f}")
+
+    def to_dict(self):
+        return {
+            'script': self.script,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'argv': sys.argv[1:],
+            'python': platform.python_version(),
+            'wall_seconds': round(time.perf_counter() - self.start, 6),
+            'peak_rss_mb': peak_rss_mb(),
+            'children_peak_rss_mb': peak_rss_mb(children=True),
+            'stages': [dict(s, seconds=round(s['seconds'], 6)) for s in self.stages],
+            'drops': dict(self.drops),
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        print(f"Stats written to '{path}'")
+
+class StageClock:
+    """
+    Splits the wall time of chained generators (parse -> postprocess ->
+    write, pulling one row at a time) into exclusive per-stage time: while
+    a stage waits for a row from the stage before it, the clock runs for
+    that one instead. Totals are cumulative over calls and can be merged
+    from worker processes (snapshot/merge).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.seconds = {}
+        self.rows = {}
+        self._current = None
+        self._mark = time.perf_counter()
+
+    def _switch(self, name):
+        now = time.perf_counter()
+        if self._current is not None:
+            self.seconds[self._current] = self.seconds.get(self._current, 0.0) + now - self._mark
+        previous, self._current, self._mark = self._current, name, now
+        return previous
+
+    @contextlib.contextmanager
+    def running(self, name):
+        """Charges the with-block to stage name (minus nested stages)."""
+        previous = self._switch(name)
+        try:
+            yield
+        finally:
+            self._switch(previous)
+
+    def iterate(self, name, iterable):
+        """Yields from iterable, charging the time spent producing each item to stage name."""
+        it = iter(iterable)
+        while True:
+            previous = self._switch(name)
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                self._switch(previous)
+            self.count(name)
+            yield item
+
+    def count(self, name, n=1):
+        self.rows[name] = self.rows.get(name, 0) + n
+
+    def snapshot(self):
+        return {'seconds': dict(self.seconds), 'rows': dict(self.rows)}
+
+    def merge(self, snapshot):
+        for name, seconds in snapshot['seconds'].items():
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        for name, n in snapshot['rows'].items():
+            self.count(name, n)
+
+def add_arguments(parser):
+    """Adds --stats-json and --profile to an argparse parser."""
+    parser.add_argument('--stats-json', help='Write per-stage timings, row counts, filter drops and peak RSS to this JSON file.')
+    parser.add_argument('--profile', help='Profile the run with cProfile and dump the stats to this file.')
+
+@contextlib.contextmanager
+def profiling(path, top=15):
+    """Runs the with-block under cProfile when path is given and dumps the stats there."""
+    if not path:
+        yield
+        return
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print("-" * 30)
+        print(f"Profile written to '{path}' (python -m pstats {path}). Top {top} by cumulative time:")
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats('cumulative').print_stats(top)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+pipeline.py
+
+Usage:
+  python pipeline.py README.md                  # merges into csv_files/merged_jobs.csv
+  python pipeline.py README.md --master csv_files/merged_jobs.csv
+  python pipeline.py snapshots/*.md --master master.arrow -o master.arrow --no-excel --split-dir tiers/
+
+Runs the whole workflow in one process:
+
+  parse -> postprocess -> dedup-merge into the master -> tier classification
+
+Rows are handed from stage to stage in memory, so nothing is written to
+CSV and parsed again in between and the interpreter and imports are paid
+once. Only the final artifacts are written: the merged master list (-o,
+which is also read as the master when --master is not given and it exists)
+and the tier workbook and/or per-tier files. At the end a table with wall
+time and rows in/out for every stage is printed; --stats-json FILE also
+writes it (with filter drop counts and peak RSS) as JSON, and --profile
+FILE dumps a cProfile of the run (see metrics.py).
+
+The merged list is deduplicated like merge_csv.py (link fingerprint, the
+new rows win over the master), and tiers are assigned like classify.py.
+"""
+import argparse
+import itertools
+import os
+import sys
+from datetime import date
+
+import classify
+import internship
+import jobs_io
+import merge_csv
+import metrics
+
+def parse_inputs(inputs, keywords, engine='soup', cache=None, workers=1):
+    """Parses every input (in a process pool when there are several) and returns the raw rows in input order."""
+    batches = internship.map_inputs(internship.parse_file, inputs, workers=workers,
+                                    keywords=keywords, engine=engine, cache=cache)
+    return list(itertools.chain.from_iterable(batches))
+
+def merge_into_master(new_rows, master_path=None, key_column='Link', raw_key=False):
+    """
+    Deduplicates the new rows followed by the master list's rows (the first
+    occurrence of a key wins, as in merge_csv.py).
+
+    Returns:
+        tuple: (unique rows, header, number of master rows read).
+    """
+    stats = {'header': [], 'total': 0}
+    master_rows = merge_csv.iter_input_rows([master_path], key_column, stats) if master_path else ()
+    rows = itertools.chain(new_rows, master_rows)
+    unique_rows = list(merge_csv.dedup_in_memory(rows, key_column, raw_key))
+
+    # 새 행의 열 순서를 기준으로, 마스터에만 있는 열은 뒤에 추가
+    header = list(internship.FIELDNAMES)
+    header += [name for name in stats['header'] if name not in header]
+    return unique_rows, header, stats['total']
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse, merge and classify job lists in one process.')
+    parser.add_argument('input', nargs='+', help='Markdown/HTML job tables (file paths or glob patterns).')
+    parser.add_argument('--master',
+                        help='Existing master list (CSV, Parquet or Arrow) to merge the new rows into '
+                             '(default: the -o file, if it exists).')
+    parser.add_argument('-o', '--output', default='csv_files/merged_jobs.csv',
+                        help='Merged master list (default: csv_files/merged_jobs.csv). May be the same file as --master.')
+    parser.add_argument('--format', choices=jobs_io.FORMATS, default='auto',
+                        help='Format of the merged list: csv, parquet or arrow (default: from the output file extension).')
+    parser.add_argument('--excel', default='csv_files/jobs_by_tier.xlsx', help='Tier workbook path.')
+    parser.add_argument('--no-excel', action='store_true', help='Skip the tier workbook.')
+    parser.add_argument('--split-dir', help='Also write one file per tier into this directory.')
+    parser.add_argument('--split-format', choices=('csv', 'parquet', 'arrow'), default='csv',
+                        help='Format of the per-tier files (default: csv).')
+    parser.add_argument('--tier-map', default=classify.DEFAULT_TIER_MAP, help='Tier map JSON file (default: tier_map.json).')
+    parser.add_argument('-k', '--key', default='Link', help="Column used for deduplication (default: 'Link').")
+    parser.add_argument('--raw-key', action='store_true',
+                        help='Deduplicate on the exact key value instead of the canonical link fingerprint.')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for parsing multiple inputs (default: number of CPUs).')
+    parser.add_argument('--keywords', help='Comma-separated keywords (case-insensitive). Overrides defaults.')
+    parser.add_argument('--exclude-keywords', help='Comma-separated keywords that reject a role even if a keyword matched.')
+    parser.add_argument('--word-boundary', action='store_true', help='Match keywords as whole words only.')
+    parser.add_argument('--engine', choices=internship.HTML_ENGINES, default='soup', help='HTML table engine.')
+    parser.add_argument('--as-of', type=date.fromisoformat,
+                        help="Reference date (YYYY-MM-DD) for relative dates like '3d' (default: today).")
+    parser.add_argument('--cache', help='Parse cache file (SQLite, created if missing), see internship.py --cache.')
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+
+    run_stats = metrics.RunStats('pipeline.py')
+    with metrics.profiling(args.profile):
+        run(args, run_stats)
+    run_stats.report()
+    if args.stats_json:
+        run_stats.drops = dict(internship.drop_counts)
+        run_stats.write_json(args.stats_json)
+
+def run(args, run_stats):
+    matcher = internship.build_matcher(args.keywords, args.exclude_keywords, args.word_boundary)
+    inputs = internship.check_inputs(internship.expand_inputs(args.input))
+    if '-' in inputs:
+        print("Error: pipeline.py does not read stdin; pass the input file path.")
+        sys.exit(1)
+    # 마스터를 주지 않았는데 -o 파일이 이미 있으면 그 파일에 병합 (새 행만으로 덮어쓰지 않도록)
+    if args.master is None and os.path.isfile(args.output):
+        args.master = args.output
+        print(f"Merging into the existing master list '{args.output}'.")
+    if args.master and not os.path.isfile(args.master):
+        print(f"Error: Master list not found at '{args.master}'")
+        sys.exit(1)
+
+    # 1. 파싱 (입력이 여러 개면 프로세스 풀에서 병렬로)
+    with run_stats.stage('parse') as stage:
+        parsed = parse_inputs(inputs, matcher, args.engine, args.cache, args.workers)
+        stage['rows_out'] = len(parsed)
+
+    # 2. 후처리: 날짜 정규화, 링크 정리, 지문 추가
+    with run_stats.stage('postprocess', len(parsed)) as stage:
+        processed = internship.postprocess_rows(parsed, args.as_of)
+        stage['rows_out'] = len(processed)
+
+    # 3. 마스터와 병합 (새 행이 우선). 마스터는 쓰기 전에 모두 읽으므로 -o가 --master와 같아도 됨
+    with run_stats.stage('merge', len(processed)) as stage:
+        merged, header, master_count = merge_into_master(processed, args.master, args.key, args.raw_key)
+        stage['rows_in'] += master_count
+        stage['rows_out'] = len(merged)
+
+    # 4. 티어 분류 (행 dict에 바로 'Tier'를 추가, pandas 사용 안 함)
+    with run_stats.stage('classify', len(merged)) as stage:
+        classified = classify.classify_jobs(merged, args.tier_map)
+        stage['rows_out'] = len(classified)
+
+    # 5. 최종 결과물만 기록 (병합 목록에는 'Tier' 열을 넣지 않음)
+    with run_stats.stage('write', len(classified)) as stage:
+        stage['rows_out'] = jobs_io.write_rows(classified, args.output, header, args.format)
+        print(f"✅ Merged {stage['rows_out']} unique rows -> {args.output}")
+        if not args.no_excel or args.split_dir:
+            columns, groups = classify.partition_by_tier(classified)
+            ordered_tiers = classify.get_tier_index(args.tier_map).ordered_tiers
+            if not args.no_excel:
+                classify.write_tier_workbook(columns, groups, ordered_tiers, args.excel)
+            if args.split_dir:
+                classify.write_tier_files(columns, groups, ordered_tiers, args.split_dir, args.split_format)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+import pytest
+
+import internship
+from benchmark import HREF_EDGE_CASES, check_href_parity, href_parity_cases
+
+@pytest.mark.parametrize('cell', HREF_EDGE_CASES)
+def test_edge_cases_match_soup(cell):
+    assert internship.extract_href(cell) == internship._extract_href_soup(cell)
+
+@pytest.mark.parametrize('cell, expected', [
+    ('<a href="https://x/1"><img src="a.png" alt="Apply"></a>', 'https://x/1'),
+    ('<img alt="<a href=\'fake\'>"><a href="real">', 'real'),
+    ('<p <a href="x">', ''),
+    ('<a href="https://x/6?a=1&amp;b=2">Apply</a>', 'https://x/6?a=1&b=2'),
+])
+def test_known_hrefs(cell, expected):
+    assert internship.extract_href(cell) == expected
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_seeded_fuzz_matches_soup(seed):
+    # 합성 표의 링크 셀과 까다로운 조각을 무작위로 이어 붙인 셀
+    mismatches = check_href_parity(href_parity_cases(5000, seed))
+    assert mismatches == []
@@ -0,0 +1,30 @@
+import pytest
+
+import jobs_io
+
+pytest.importorskip('pyarrow')
+
+FIELDNAMES = ['Company', 'Role', 'Location', 'Link', 'Date Posted']
+DATES = ['2025-01-02', 'Closed', '', '20250104']
+
+def make_rows(n):
+    return [{'Company': f'Company {i % 3000}', 'Role': 'SWE Intern', 'Location': f'City {i % 500}',
+             'Link': f'https://example.com/{i}', 'Date Posted': DATES[i % len(DATES)]}
+            for i in range(n)]
+
+@pytest.mark.parametrize('ext', ['.arrow', '.parquet'])
+def test_round_trip_over_several_batches(tmp_path, ext):
+    rows = make_rows(jobs_io.BATCH_ROWS + 5000)
+    path = str(tmp_path / ('jobs' + ext))
+    assert jobs_io.write_rows(rows, path, FIELDNAMES) == len(rows)
+    assert jobs_io.read_fieldnames(path) == FIELDNAMES
+    assert list(jobs_io.iter_rows(path)) == rows
+
+def test_read_frame_keeps_non_iso_dates(tmp_path):
+    path = str(tmp_path / 'jobs.arrow')
+    jobs_io.write_rows(make_rows(8), path, FIELDNAMES)
+    df = jobs_io.read_frame(path)
+    assert 'Date Posted (text)' not in df.columns
+    assert df['Date Posted'][1] == 'Closed'
+    assert df['Date Posted'][3] == '20250104'
+    assert str(df['Date Posted'][0]) == '2025-01-02'
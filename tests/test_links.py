@@ -0,0 +1,33 @@
+import pytest
+
+import merge_csv
+from links import canonicalize_link, link_fingerprint
+
+SAME_POSTING = [
+    'https://jobs.example.com/apply/123?team=swe&loc=ny',
+    'http://www.jobs.example.com/apply/123/?loc=ny&team=swe&utm_source=Simplify',
+    'https://JOBS.example.com:443/apply/123?ref=Simplify&team=swe&gh_src=x&loc=ny',
+]
+
+def test_variants_share_one_canonical_form():
+    assert {canonicalize_link(url) for url in SAME_POSTING} == {'https://jobs.example.com/apply/123?loc=ny&team=swe'}
+    assert len({link_fingerprint(url) for url in SAME_POSTING}) == 1
+
+@pytest.mark.parametrize('other', [
+    'https://jobs.example.com/apply/124?team=swe&loc=ny',
+    'https://jobs.example.com/apply/123?team=swe&loc=sf',
+    'https://jobs.example.com:8443/apply/123?team=swe&loc=ny',
+])
+def test_different_postings_stay_apart(other):
+    assert link_fingerprint(other) != link_fingerprint(SAME_POSTING[0])
+
+def test_dedup_key_recomputes_invalid_fingerprints():
+    row = {'Link': SAME_POSTING[1], 'Fingerprint': 'not-a-hash'}
+    assert merge_csv.dedup_key(row, 'Link') == link_fingerprint(SAME_POSTING[0])
+    assert row['Fingerprint'] == link_fingerprint(SAME_POSTING[0])
+
+def test_dedup_key_uses_other_key_columns():
+    a = {'Company': 'Acme', 'Link': SAME_POSTING[0], 'Fingerprint': link_fingerprint(SAME_POSTING[0])}
+    b = {'Company': 'Globex', 'Link': SAME_POSTING[1], 'Fingerprint': link_fingerprint(SAME_POSTING[1])}
+    assert merge_csv.dedup_key(a, 'Company') != merge_csv.dedup_key(b, 'Company')
+    assert merge_csv.dedup_key(a, 'Link') == merge_csv.dedup_key(b, 'Link')
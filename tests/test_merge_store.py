@@ -0,0 +1,34 @@
+import merge_csv
+
+def make_row(i, role):
+    return {'Company': f'Company {i}', 'Role': role, 'Location': 'NY',
+            'Link': f'https://example.com/jobs/{i}', 'Date Posted': '2025-01-01'}
+
+def store_rows(conn):
+    return conn.execute("SELECT data, batch, first_seen, last_seen FROM jobs ORDER BY batch DESC, rowid").fetchall()
+
+def test_new_batch_replaces_stored_rows(tmp_path):
+    conn = merge_csv.open_store(str(tmp_path / 'master.db'), merge_csv.store_key_spec('Link'))
+    batch = merge_csv.next_batch(conn)
+    for i in range(4):
+        assert merge_csv.upsert_row(conn, make_row(i, 'old'), 'Link', batch, 'day 1')
+
+    batch = merge_csv.next_batch(conn)
+    assert batch == 2
+    added = [merge_csv.upsert_row(conn, make_row(i, role), 'Link', batch, 'day 2')
+             for i, role in [(5, 'new'), (2, 'new'), (5, 'dup')]]
+    assert added == [True, False, False]
+
+    rows = store_rows(conn)
+    # 새 배치가 입력 순서대로 먼저, 같은 배치 안에서는 첫 행이 우선
+    assert [r[0].count('"new"') for r in rows[:2]] == [1, 1]
+    assert '"Company 5"' in rows[0][0] and '"Company 2"' in rows[1][0]
+    assert rows[1][1:] == (2, 'day 1', 'day 2')
+    assert len(rows) == 5
+
+def test_batch_counter_does_not_scan_jobs(tmp_path):
+    conn = merge_csv.open_store(str(tmp_path / 'master.db'), merge_csv.store_key_spec('Link'))
+    merge_csv.next_batch(conn)
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT value FROM meta WHERE name = 'batch'").fetchall()
+    assert not any('SCAN' in step[-1] for step in plan)
+    assert merge_csv.next_batch(conn) == 2
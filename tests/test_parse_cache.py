@@ -0,0 +1,45 @@
+import internship
+from benchmark import generate_markdown
+
+def parse(path, cache_path):
+    cache = internship.ParseCache(cache_path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return internship.parse_with_cache(f, internship.DEFAULT_KEYWORDS, 'soup', cache), cache.block_hits
+    finally:
+        cache.close()
+
+def entry_count(cache_path):
+    cache = internship.ParseCache(cache_path)
+    try:
+        return cache.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    finally:
+        cache.close()
+
+def test_cached_rows_match_and_old_versions_are_pruned(tmp_path):
+    path = tmp_path / 'snapshot.md'
+    cache_path = str(tmp_path / 'cache.db')
+    lines = generate_markdown(3000, seed=1).splitlines(keepends=True)
+
+    counts = []
+    for step in range(4):
+        # 새 공고를 표 맨 위에 추가하는 폴링을 흉내 냄
+        added = generate_markdown(5 * step, seed=10 + step).splitlines(keepends=True)[3:]
+        text = ''.join(lines[:3] + added + lines[3:])
+        path.write_text(text, encoding='utf-8')
+        rows, block_hits = parse(path, cache_path)
+        assert rows == internship.parse_markdown_table(text, internship.DEFAULT_KEYWORDS)
+        if step:
+            assert block_hits > 0
+        counts.append(entry_count(cache_path))
+    # 이전 버전의 항목이 지워져 캐시 크기가 폴링마다 늘지 않음
+    assert max(counts) - min(counts) <= 2
+
+def test_unchanged_input_is_a_whole_file_hit(tmp_path):
+    path = tmp_path / 'snapshot.md'
+    path.write_text(generate_markdown(500), encoding='utf-8')
+    cache_path = str(tmp_path / 'cache.db')
+    first, _ = parse(path, cache_path)
+    second, block_hits = parse(path, cache_path)
+    assert second == first
+    assert block_hits == 0
@@ -0,0 +1,32 @@
+import random
+
+import merge_csv
+
+def make_rows(n, seed=0):
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        # 같은 공고가 추적 파라미터만 다르게 여러 번 나오도록 구성
+        job = rnd.randrange(n // 3)
+        rows.append({'Company': f'Company {job}', 'Role': f'row {i}',
+                     'Link': f'https://jobs.example.com/{job}?utm_source=list{rnd.randrange(3)}'})
+    return rows
+
+def test_partitioned_matches_in_memory():
+    rows = make_rows(3000)
+    expected = list(merge_csv.dedup_in_memory([dict(r) for r in rows], 'Link'))
+    for partitions in (1, 7, 64):
+        assert list(merge_csv.dedup_partitioned([dict(r) for r in rows], 'Link', partitions)) == expected
+
+def test_first_occurrence_wins_in_input_order():
+    rows = make_rows(600, seed=1)
+    unique = list(merge_csv.dedup_partitioned([dict(r) for r in rows], 'Link', 8))
+    first_rows = {}
+    for r in rows:
+        first_rows.setdefault(r['Company'], r['Role'])
+    assert [r['Role'] for r in unique] == list(first_rows.values())
+
+def test_raw_key_keeps_tracking_variants_apart():
+    rows = make_rows(900, seed=2)
+    unique = list(merge_csv.dedup_partitioned([dict(r) for r in rows], 'Link', 4, raw_key=True))
+    assert len(unique) == len({r['Link'] for r in rows})
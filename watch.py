@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+watch.py
+
+Usage:
+  python watch.py snapshots/ --store master.db --delta-dir deltas/
+  python watch.py snapshots/ --store master.db --delta-dir deltas/ --pattern "*.md" --interval 0.2
+
+Watches a directory of mirrored job list snapshots (.md files with a
+Markdown or HTML table) and keeps a SQLite master store (see
+merge_csv.py --store) up to date without batch re-runs.
+
+When a snapshot changes, only its table rows whose text changed are parsed
+again (the cells of unchanged rows are kept in memory from the previous
+version), only rows that differ from the previous version go through
+postprocess_rows, and they are upserted into the store. Postings whose key
+was not in the store yet are written to a new delta file in --delta-dir,
+named after the snapshot and the time of the change.
+
+On start every snapshot is read once, so postings added while the watcher
+was not running also end up in a delta. Changes are found by polling file
+mtimes and sizes every --interval seconds (stdlib only, no extra package).
+"""
+import argparse
+import fnmatch
+import os
+import sys
+import time
+from datetime import date, datetime
+
+import internship
+import jobs_io
+import merge_csv
+
+ROW_FIELDS = ('Company', 'Role', 'Date Posted', 'Location', 'Link')
+
+class SnapshotDiffer:
+    """
+    Per-snapshot memory of the last version: the cells of every table row
+    (keyed by the row's raw text) and the set of extracted rows.
+    """
+
+    def __init__(self, keywords, engine='soup'):
+        self.keywords = internship.as_matcher(keywords)
+        self.engine = engine
+        self.cells = {}
+        self.rows = set()
+
+    def update(self, text):
+        """
+        Reads the new version of the snapshot.
+
+        Returns:
+            tuple: (rows that were not in the previous version, raw and not
+            yet postprocessed; number of table rows that had to be parsed).
+        """
+        is_html, units = internship.split_row_units(text)
+
+        # 이전 버전에 있던 행은 다시 파싱하지 않고, 새로 나타난 행만 파싱
+        missing = [unit for unit in dict.fromkeys(units) if unit not in self.cells]
+        cells = dict(zip(missing, internship.parse_row_units(missing, is_html, self.engine)))
+        for unit in units:
+            if unit not in cells:
+                cells[unit] = self.cells[unit]
+        self.cells = cells
+        rows = internship.rows_from_cells([cells[unit] for unit in units], is_html, self.keywords)
+
+        # 행 단위 비교: 내용(↳ 행은 물려받은 회사 포함)이 같은 행은 건너뜀
+        current = {tuple(r[name] for name in ROW_FIELDS) for r in rows}
+        changed = [r for r in rows if tuple(r[name] for name in ROW_FIELDS) not in self.rows]
+        self.rows = current
+        return changed, len(missing)
+
+def scan(directory, pattern):
+    """Returns {path: (mtime_ns, size)} of the snapshot files in directory."""
+    found = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and fnmatch.fnmatch(entry.name, pattern):
+                st = entry.stat()
+                found[entry.path] = (st.st_mtime_ns, st.st_size)
+    return found
+
+def delta_path(delta_dir, snapshot_path, fmt):
+    stem = os.path.splitext(os.path.basename(snapshot_path))[0]
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    return os.path.join(delta_dir, f'{stem}-{stamp}' + jobs_io.FORMAT_EXTENSIONS[fmt])
+
+def apply_change(path, differ, conn, args):
+    """Re-reads one changed snapshot, upserts its changed rows and writes the delta file."""
+    start = time.perf_counter()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except FileNotFoundError:
+        # 스캔과 읽기 사이에 파일이 삭제됨: 다음 스캔에서 정리
+        return
+
+    changed, parsed_units = differ.update(text)
+    as_of = args.as_of or date.today()
+    processed = internship.postprocess_rows(changed, as_of)
+
+    now = datetime.now().isoformat(timespec='seconds')
+    added = []
+    with conn:
+        merge_csv.init_store_header(conn, internship.FIELDNAMES, args.key, args.raw_key)
+        batch = merge_csv.next_batch(conn)
+        for row in processed:
+            if merge_csv.upsert_row(conn, row, args.key, batch, now, args.raw_key):
+                added.append(row)
+
+    name = os.path.basename(path)
+    if added:
+        out = delta_path(args.delta_dir, path, args.format)
+        jobs_io.write_rows(added, out, merge_csv.store_header(conn), args.format)
+        elapsed = time.perf_counter() - start
+        print(f"✅ [{name}] {len(added)} new postings -> {out} "
+              f"(parsed {parsed_units} rows, {len(changed)} changed, {elapsed:.3f}s)")
+    else:
+        elapsed = time.perf_counter() - start
+        print(f"[{name}] no new postings (parsed {parsed_units} rows, {len(changed)} changed, {elapsed:.3f}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Watch a directory of job list snapshots and emit newly added postings.')
+    parser.add_argument('directory', help='Directory with the mirrored snapshot files.')
+    parser.add_argument('--store', required=True, help='SQLite master store to upsert into (created if missing).')
+    parser.add_argument('--delta-dir', default='deltas', help='Directory for the delta files (default: deltas).')
+    parser.add_argument('--format', choices=('csv', 'parquet', 'arrow'), default='csv',
+                        help='Format of the delta files (default: csv).')
+    parser.add_argument('--pattern', default='*.md', help="Snapshot file name pattern (default: '*.md').")
+    parser.add_argument('--interval', type=float, default=0.2, help='Seconds between directory scans (default: 0.2).')
+    parser.add_argument('--once', action='store_true', help='Process the current snapshots once and exit.')
+    parser.add_argument('-k', '--key', default='Link', help="Column used as the store key (default: 'Link').")
+    parser.add_argument('--raw-key', action='store_true',
+                        help='Key the store on the exact key value instead of the canonical link fingerprint.')
+    parser.add_argument('--keywords', help='Comma-separated keywords (case-insensitive). Overrides defaults.')
+    parser.add_argument('--exclude-keywords', help='Comma-separated keywords that reject a role even if a keyword matched.')
+    parser.add_argument('--word-boundary', action='store_true', help='Match keywords as whole words only.')
+    parser.add_argument('--engine', choices=internship.HTML_ENGINES, default='soup', help='HTML table engine.')
+    parser.add_argument('--as-of', type=date.fromisoformat,
+                        help="Reference date (YYYY-MM-DD) for relative dates like '3d' (default: the day of the change).")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        print(f"Error: Directory not found at '{args.directory}'")
+        sys.exit(1)
+    os.makedirs(args.delta_dir, exist_ok=True)
+    matcher = internship.build_matcher(args.keywords, args.exclude_keywords, args.word_boundary)
+    conn = merge_csv.open_store(args.store, merge_csv.store_key_spec(args.key, args.raw_key))
+
+    differs = {}
+    seen = {}
+    print(f"Watching '{args.directory}' ({args.pattern}) -> store '{args.store}', deltas in '{args.delta_dir}'")
+    try:
+        while True:
+            current = scan(args.directory, args.pattern)
+            for path in sorted(current):
+                if seen.get(path) != current[path]:
+                    differ = differs.setdefault(path, SnapshotDiffer(matcher, args.engine))
+                    apply_change(path, differ, conn, args)
+            # 삭제된 파일의 상태는 버림
+            for path in set(differs) - set(current):
+                del differs[path]
+            seen = current
+            if args.once:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("Stopped.")
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    main()